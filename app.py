@@ -6,13 +6,13 @@ Flask web application that provides a browser interface for the resume_query sys
 """
 
 from flask import Flask, render_template, request, jsonify
-import json
 import os
 import glob
 from resume_query.database import ResumeVectorDB
 from resume_query.search import create_resume_bm25_index, retrieve_hybrid_resume
 from resume_query.config import DEFAULT_RESUME_FILE, get_db_name_from_file
 from resume_query.reranking import create_reranker
+from resume_query.data_processing import load_resume_file
 
 app = Flask(__name__)
 
@@ -133,16 +133,23 @@ def get_available_databases():
     if not os.path.exists(data_dir):
         return databases
     
-    # Look for directories containing vector_db.pkl files
+    # Look for directories containing a saved database (or a legacy vector_db.pkl)
     for item in os.listdir(data_dir):
         db_path = os.path.join(data_dir, item)
         if os.path.isdir(db_path):
-            vector_db_file = os.path.join(db_path, "vector_db.pkl")
-            if os.path.exists(vector_db_file):
+            manifest_file = os.path.join(db_path, "manifest.json")
+            legacy_file = os.path.join(db_path, "vector_db.pkl")
+            if os.path.exists(manifest_file):
                 databases.append({
                     'name': item,
                     'path': db_path,
-                    'size': os.path.getsize(vector_db_file)
+                    'size': sum(entry.stat().st_size for entry in os.scandir(db_path) if entry.is_file())
+                })
+            elif os.path.exists(legacy_file):
+                databases.append({
+                    'name': item,
+                    'path': db_path,
+                    'size': os.path.getsize(legacy_file)
                 })
     
     return sorted(databases, key=lambda x: x['name'])
@@ -176,8 +183,7 @@ def initialize_database(db_name=None):
         
         # Load original candidates data (for links access)
         print("📄 Loading original candidates data...")
-        with open(DEFAULT_RESUME_FILE, 'r') as f:
-            candidates_data = json.load(f)
+        candidates_data = load_resume_file(DEFAULT_RESUME_FILE)
         
         # Load and process resume data
         resume_db.load_data(DEFAULT_RESUME_FILE)
@@ -196,7 +202,7 @@ def initialize_database(db_name=None):
         # Try to initialize reranker
         try:
             print("🔧 Initializing Cohere reranker...")
-            reranker = create_reranker()
+            reranker = create_reranker(embed_fn=resume_db.cached_query_embedding)
             if reranker:
                 print("✅ Reranking ready!")
             else:
@@ -333,9 +339,11 @@ def search():
                 # Convert BM25 results to standard format
                 results = []
                 for result in bm25_results:
-                    metadata = next((meta for meta in resume_db.metadata 
-                                   if meta['candidate_id'] == result['candidate_id']), None)
-                    if metadata:
+                    candidate_chunks = resume_db.get_candidate_metadata(result['candidate_id'])
+                    if candidate_chunks:
+                        # Prefer the chunk of the same type as the BM25 hit
+                        metadata = next((meta for meta in candidate_chunks
+                                         if meta['chunk_type'] == result['chunk_type']), candidate_chunks[0])
                         results.append({
                             'metadata': metadata,
                             'content': result['content'],
@@ -357,7 +365,7 @@ def search():
                 current_reranker = reranker
                 if not current_reranker or current_reranker.model != rerank_model:
                     from resume_query.reranking import create_reranker
-                    current_reranker = create_reranker(model=rerank_model)
+                    current_reranker = create_reranker(model=rerank_model, embed_fn=resume_db.cached_query_embedding)
                 
                 if current_reranker:
                     reranked_results, rerank_metadata = current_reranker.rerank_search_results(
@@ -368,10 +376,14 @@ def search():
                     )
                     results = reranked_results
                     search_info.update({
-                        'reranked': True,
+                        'reranked': rerank_metadata['reranked'],
                         'rerank_metadata': rerank_metadata
                     })
-                    print(f"✅ Reranking completed: {rerank_metadata.get('candidates_reranked', 0)} candidates reranked with {rerank_model}")
+                    if rerank_metadata['reranked']:
+                        print(f"✅ Reranking completed: {rerank_metadata.get('candidates_reranked', 0)} candidates reranked with {rerank_model}")
+                    else:
+                        print(f"⚠️ {rerank_metadata['reason']}, using original results")
+                        search_info['rerank_error'] = rerank_metadata['reason']
                 else:
                     raise Exception(f"Could not create reranker with model {rerank_model}")
                     
@@ -447,8 +459,7 @@ def get_candidate(candidate_id):
     
     try:
         # Find all chunks for this candidate
-        candidate_chunks = [meta for meta in resume_db.metadata 
-                          if meta['candidate_id'] == candidate_id]
+        candidate_chunks = resume_db.get_candidate_metadata(candidate_id)
         
         if not candidate_chunks:
             return jsonify({'error': 'Candidate not found'}), 404
@@ -463,12 +474,26 @@ def get_candidate(candidate_id):
         
         # Find links from original candidates data
         candidate_links = []
+        original_candidate = None
         if candidates_data:
             original_candidate = next((c for c in candidates_data 
                                      if c.get('candidate_id') == candidate_id), None)
             if original_candidate:
                 candidate_links = original_candidate.get('links', [])
         
+        # Candidates with positions or education have no summary chunk; build
+        # the profile summary from the original data instead
+        if not candidate_summary and original_candidate:
+            candidate_summary = {
+                'chunk_type': 'candidate_summary',
+                'candidate_id': candidate_id,
+                'name': original_candidate.get('name', 'Unknown'),
+                'email': original_candidate.get('email', ''),
+                'location': original_candidate.get('location', ''),
+                'headline': original_candidate.get('headline', ''),
+                'stage': original_candidate.get('stage', '')
+            }
+        
         return jsonify({
             'candidate_id': candidate_id,
             'summary': candidate_summary,
@@ -0,0 +1,15 @@
+# cython: language_level=3
+"""
+Compiled chunk content builders.
+
+Optional speedup for resume_query.data_processing, which falls back to its
+pure-Python format_position when this module is not built. Build in place with:
+
+    cythonize -i resume_query/_chunk_build.pyx
+"""
+
+
+def format_position(org, title, summary):
+    """Build the searchable content string for one position."""
+    cdef str out = f"Company: {org}\nTitle: {title}\n\nExperience Details:\n{summary}"
+    return out.strip()
@@ -11,6 +11,8 @@ load_dotenv()
 # Elasticsearch configuration
 ELASTICSEARCH_HOST = "http://localhost:9200"
 DEFAULT_INDEX_NAME = "resume_bm25_index"
+BM25_BULK_THREADS = 4  # Concurrent bulk requests when indexing chunks
+BM25_BULK_CHUNK_SIZE = 1000  # Documents per bulk request
 
 # Search configuration
 DEFAULT_SEARCH_RESULTS = 10
@@ -23,8 +25,25 @@ DEFAULT_BM25_WEIGHT = 0.3
 
 # Database configuration
 DEFAULT_DB_NAME = "resume_db"
-DEFAULT_BATCH_SIZE = 128
-EMBEDDING_MODEL = "voyage-2"
+DEFAULT_BATCH_SIZE = 128  # Hard cap on texts per embedding request
+MAX_BATCH_TOKENS = 10000  # Approximate token budget per embedding request
+EMBEDDING_MAX_WORKERS = 8  # Embedding batches in flight at once
+EMBEDDING_MAX_RETRIES = 5  # Attempts per batch on rate limits / transient errors
+EMBEDDING_CACHE_PATH = "./data/embedding_cache.pkl"  # SHA-256(model/dim/dtype, text) -> embedding, shared across databases
+EMBEDDING_MODEL = "voyage-3.5-lite"
+EMBEDDING_DIM = 256  # Matryoshka output dimension (None for the model default)
+EMBEDDING_DTYPE = "int8"  # Voyage output dtype: "float" or "int8"
+EMBEDDING_QUANTIZATION = "int8"  # "int8" scores against 1-byte embeddings, None keeps float32
+BINARY_PREFILTER_SIZE = 500  # Hamming shortlist size rescored exactly (0 disables the prefilter)
+HNSW_MIN_VECTORS = 50_000  # Build an approximate HNSW FAISS index instead of an exact one at this many chunks
+HNSW_M = 16  # HNSW graph neighbours per node
+HNSW_EF_CONSTRUCTION = 200  # HNSW build-time candidate list size
+HNSW_EF_SEARCH = 64  # HNSW query-time candidate list size (higher = better recall, slower)
+
+# Query caches (persisted per database in query_cache.sqlite)
+QUERY_RESULTS_CACHE_SIZE = 1000  # Most recently used exact-query results kept across sessions
+SEMANTIC_CACHE_SIZE = 256  # Recent query embeddings kept for near-duplicate lookup
+SEMANTIC_CACHE_THRESHOLD = 0.97  # Cosine similarity at which a past query's results are reused
 
 # Voyage AI configuration
 VOYAGE_API_KEY = os.getenv("VOYAGE_API_KEY")
@@ -42,8 +61,18 @@ LEVER_API_KEY = os.getenv("LEVER_API_KEY")
 # Reranking configuration (Cohere)
 RERANK_MODEL = "rerank-v3.5"  # Options: "rerank-v3.5", "rerank-english-v3.0", "rerank-multilingual-v3.0", "rerank-english-v2.0"
 RERANK_TOP_N = 50  # Number of top results to rerank (for efficiency)
+RERANK_MAX_WORKERS = 4  # Concurrent Cohere requests when documents exceed one request's limit
+RERANK_CHARS_PER_TOKEN = 4  # Heuristic used to truncate documents to the model's token window before sending
+RERANK_CONTENT_CACHE_SIZE = 10_000  # Memoized content strings rebuilt from metadata for candidates without content
 ENABLE_RERANKING = True  # Whether to enable reranking by default
 RERANK_CACHE_ENABLED = True  # Whether to cache rerank results
+RERANK_CACHE_SIZE = 100_000  # Max (query, document) scores kept in the rerank score cache
+RERANK_MEMORY_CACHE_SIZE = 10_000  # Most recently used rerank scores also kept in memory (LRU)
+RERANK_CACHE_TTL = 900  # Seconds a cached rerank score stays valid
+RERANK_CACHE_PATH = "./data/rerank_cache.sqlite"  # Where rerank scores persist across sessions
+RERANK_SEMANTIC_CACHE_SIZE = 256  # Recent rerank queries kept for near-duplicate lookup
+RERANK_SEMANTIC_THRESHOLD = 0.92  # Query cosine similarity at which a past ranking is reused
+RERANK_OVERLAP_THRESHOLD = 0.8  # Minimum Jaccard overlap between past and current document sets
 
 
 def get_db_name_from_file(resume_file: str) -> str:
@@ -4,9 +4,22 @@ Resume Data Processing Module
 Handles parsing, chunking, and formatting of resume data.
 """
 
-from typing import List, Dict, Any
-from datetime import datetime
+import json
+from typing import List, Dict, Any, Iterable, Iterator
 from tqdm import tqdm
+from resume_query.records import Chunk
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; files are parsed with the json module
+    orjson = None
+
+try:
+    from resume_query._chunk_build import format_position
+except ImportError:  # the Cython build is optional; use the pure-Python builder below
+    format_position = None
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
 
 def format_date(date_dict: Dict) -> str:
@@ -26,17 +39,33 @@ def format_date(date_dict: Dict) -> str:
     month = date_dict.get('month', '')
     
     if year and month:
-        try:
-            return f"{datetime(year, month, 1).strftime('%b %Y')}"
-        except:
-            return f"{month}/{year}"
+        if isinstance(month, int) and 1 <= month <= 12:
+            return f"{MONTHS[month - 1]} {year}"
+        return f"{month}/{year}"
     elif year:
         return str(year)
     else:
         return ""
 
 
-def process_resume_data(resume_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def load_resume_file(resume_file_path: str) -> List[Dict[str, Any]]:
+    """
+    Load a candidate JSON file.
+    
+    Args:
+        resume_file_path: Path to the JSON list of candidates
+        
+    Returns:
+        List of candidate dictionaries
+    """
+    if orjson is not None:
+        with open(resume_file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(resume_file_path, 'r') as f:
+        return json.load(f)
+
+
+def process_resume_data(resume_data: List[Dict[str, Any]]) -> List[Chunk]:
     """
     Process resume JSON data into searchable chunks.
     
@@ -46,24 +75,57 @@ def process_resume_data(resume_data: List[Dict[str, Any]]) -> List[Dict[str, Any
     Returns:
         List of processed chunks with metadata
     """
-    chunks = []
+    return list(process_resume_data_iter(tqdm(resume_data, desc="Processing candidates")))
+
+
+def process_resume_data_iter(resume_data: Iterable[Dict[str, Any]]) -> Iterator[Chunk]:
+    """
+    Lazily process candidates into searchable chunks, one candidate at a time.
     
-    for candidate in tqdm(resume_data, desc="Processing candidates"):
-        candidate_id = candidate.get('candidate_id', 'unknown')
-        name = candidate.get('name', 'Unknown')
-        email = candidate.get('email', '')
-        location = candidate.get('location', '')
-        headline = candidate.get('headline', '')
-        stage = candidate.get('stage', '')
+    Args:
+        resume_data: Iterable of candidate dictionaries from JSON
         
-        # Create candidate summary chunk (focus on professionally relevant content)
-        candidate_summary = f"""
-        Location: {location}
-        """.strip()
+    Yields:
+        Processed chunks with metadata, grouped by candidate in input order
+    """
+    for candidate in resume_data:
+        yield from chunk_candidate(candidate)
+
+
+def chunk_candidate(candidate: Dict[str, Any]) -> List[Chunk]:
+    """
+    Build the searchable chunks for one candidate.
+    
+    Args:
+        candidate: Candidate dictionary from JSON
         
-        chunks.append({
-            'content': candidate_summary,
-            'metadata': {
+    Returns:
+        The candidate's chunks with metadata
+    """
+    candidate_id = candidate.get('candidate_id', 'unknown')
+    name = candidate.get('name', 'Unknown')
+    email = candidate.get('email', '')
+    location = candidate.get('location', '')
+    headline = candidate.get('headline', '')
+    stage = candidate.get('stage', '')
+    
+    parsed_resume = candidate.get('parsed_resume', {})
+    
+    # Process individual positions and schools/education
+    candidate_chunks = [
+        _position_chunk(position, i, candidate_id, name, email)
+        for i, position in enumerate(parsed_resume.get('positions', []))
+    ]
+    candidate_chunks.extend(
+        _education_chunk(school, i, candidate_id, name, email)
+        for i, school in enumerate(parsed_resume.get('schools', []))
+    )
+    
+    if not candidate_chunks:
+        # Keep a summary chunk so candidates without a parsed resume stay searchable
+        return [Chunk(
+            content=f"Location: {location}".strip(),
+            metadata={
                 'chunk_type': 'candidate_summary',
                 'candidate_id': candidate_id,
                 'name': name,
@@ -72,97 +134,66 @@ def process_resume_data(resume_data: List[Dict[str, Any]]) -> List[Dict[str, Any
                 'headline': headline,
                 'stage': stage
             }
-        })
-        
-        # Process individual positions
-        parsed_resume = candidate.get('parsed_resume', {})
-        positions = parsed_resume.get('positions', [])
-        
-        for i, position in enumerate(positions):
-            org = position.get('org', '')
-            title = position.get('title', '')
-            summary = position.get('summary', '')
-            location_pos = position.get('location', '')
-            start = position.get('start', {})
-            end = position.get('end', {})
-            
-            # Format dates
-            start_date = format_date(start)
-            end_date = format_date(end) if end else "Present"
-            
-            position_text = f"""
-            Company: {org}
-            Title: {title}
-            
-            Experience Details:
-            {summary}
-            """.strip()
-            
-            chunks.append({
-                'content': position_text,
-                'metadata': {
-                    'chunk_type': 'position',
-                    'candidate_id': candidate_id,
-                    'name': name,
-                    'email': email,
-                    'position_index': i,
-                    'company': org,
-                    'title': title,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'location': location_pos,
-                    'summary': summary
-                }
-            })
-        
-        # Process individual schools/education
-        schools = parsed_resume.get('schools', [])
-        
-        for i, school in enumerate(schools):
-            org = school.get('org', '')
-            degree = school.get('degree', '')
-            
-            education_text = f"""
-            School: {org}
-            Degree: {degree}
-            """.strip()
-            
-            chunks.append({
-                'content': education_text,
-                'metadata': {
-                    'chunk_type': 'education',
-                    'candidate_id': candidate_id,
-                    'name': name,
-                    'email': email,
-                    'education_index': i,
-                    'school_name': org,
-                    'degree': degree
-                }
-            })
+        )]
     
-    return chunks
+    # A summary chunk would only hold the location, so fold it into the
+    # first chunk instead of embedding and searching an extra vector
+    if location:
+        first_chunk = candidate_chunks[0]
+        first_chunk.content = f"Location: {location}\n{first_chunk.content}"
+    return candidate_chunks
 
 
-def get_content_from_metadata(metadata: Dict[str, Any]) -> str:
-    """
-    Reconstruct content from metadata for display.
+def chunk_index(metadata: Dict[str, Any]) -> int:
+    """Return a chunk's index among its candidate's chunks of the same type (0 for summary chunks)."""
+    return metadata.get('position_index', metadata.get('education_index', 0))
+
+
+if format_position is None:
+    def format_position(org: str, title: str, summary: str) -> str:
+        """Build the searchable content string for one position."""
+        return f"Company: {org}\nTitle: {title}\n\nExperience Details:\n{summary}".strip()
+
+
+def _position_chunk(position: Dict[str, Any], index: int, candidate_id: str, name: str, email: str) -> Chunk:
+    """Build the searchable chunk for one position."""
+    org = position.get('org', '')
+    title = position.get('title', '')
+    summary = position.get('summary', '')
+    end = position.get('end', {})
     
-    Args:
-        metadata: Chunk metadata dictionary
-        
-    Returns:
-        Reconstructed content string
-    """
-    if metadata['chunk_type'] == 'candidate_summary':
-        return f"""Location: {metadata['location']}"""
-    elif metadata['chunk_type'] == 'education':
-        return f"""School: {metadata['school_name']}
-Degree: {metadata['degree']}"""
-    else:  # position
-        return f"""Company: {metadata['company']}
-Title: {metadata['title']}
-Duration: {metadata['start_date']} - {metadata['end_date']}
-Location: {metadata['location']}
-
-Experience Details:
-{metadata['summary']}"""
\ No newline at end of file
+    return Chunk(
+        content=format_position(org, title, summary),
+        metadata={
+            'chunk_type': 'position',
+            'candidate_id': candidate_id,
+            'name': name,
+            'email': email,
+            'position_index': index,
+            'company': org,
+            'title': title,
+            'start_date': format_date(position.get('start', {})),
+            'end_date': format_date(end) if end else "Present",
+            'location': position.get('location', ''),
+            'summary': summary
+        }
+    )
+
+
+def _education_chunk(school: Dict[str, Any], index: int, candidate_id: str, name: str, email: str) -> Chunk:
+    """Build the searchable chunk for one school."""
+    org = school.get('org', '')
+    degree = school.get('degree', '')
+    
+    return Chunk(
+        content=f"School: {org}\nDegree: {degree}".strip(),
+        metadata={
+            'chunk_type': 'education',
+            'candidate_id': candidate_id,
+            'name': name,
+            'email': email,
+            'education_index': index,
+            'school_name': org,
+            'degree': degree
+        }
+    )
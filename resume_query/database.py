@@ -7,13 +7,42 @@ Handles vector database operations for resume search.
 import os
 import pickle
 import json
+import time
+import random
+import hashlib
+import sqlite3
+import threading
+from contextlib import closing
+from collections import defaultdict, OrderedDict
 import numpy as np
 import voyageai
-from typing import List, Dict, Any
+from voyageai.error import RateLimitError, ServiceUnavailableError, APIConnectionError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
 from tqdm import tqdm
 
-from resume_query.config import DEFAULT_DB_NAME, DEFAULT_BATCH_SIZE, EMBEDDING_MODEL
-from resume_query.data_processing import process_resume_data, get_content_from_metadata
+try:
+    import faiss
+except ImportError:  # faiss is optional; search falls back to NumPy
+    faiss = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; JSON is parsed with the json module
+    orjson = None
+
+from resume_query.config import (
+    DEFAULT_DB_NAME, DEFAULT_BATCH_SIZE, MAX_BATCH_TOKENS, EMBEDDING_MAX_WORKERS, EMBEDDING_MAX_RETRIES, EMBEDDING_CACHE_PATH,
+    EMBEDDING_MODEL, EMBEDDING_DIM, EMBEDDING_DTYPE, EMBEDDING_QUANTIZATION,
+    BINARY_PREFILTER_SIZE, HNSW_MIN_VECTORS, HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH, QUERY_RESULTS_CACHE_SIZE, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD
+)
+from resume_query.data_processing import load_resume_file, process_resume_data, chunk_index
+from resume_query.vector_ops import quantize_int8, int8_matvec, float_matvec, pack_sign_bits, hamming_distances
+
+# Identifies the vector space: vectors from different models, dimensions or dtypes are not comparable
+EMBEDDING_SPEC = "/".join(str(part) for part in (EMBEDDING_MODEL, EMBEDDING_DIM, EMBEDDING_DTYPE) if part not in (None, "float"))
+# vector_db.pkl databases predate the manifest and were always built with voyage-2
+LEGACY_EMBEDDING_SPEC = "voyage-2"
 
 
 class ResumeVectorDB:
@@ -24,10 +53,30 @@ class ResumeVectorDB:
             api_key = os.getenv("VOYAGE_API_KEY")
         self.client = voyageai.Client(api_key=api_key)
         self.name = name
-        self.embeddings = []
+        self.embeddings = np.empty((0, 0), dtype=np.float32)
         self.metadata = []
+        self.contents = []
+        self._by_cid = {}
+        self._chunk_index = {}
+        self.embeddings_i8 = None
+        self.embeddings_bits = None
+        self.scale = 1.0
         self.query_cache = {}
-        self.db_path = f"./data/{name}/vector_db.pkl"
+        self.results_cache = OrderedDict()  # query -> (row indices, scores), most recently used last
+        self.recent_qembs = np.empty((0, 0), dtype=np.float32)
+        self.recent_results = []
+        # search runs on worker threads (hybrid search, Flask requests), so the result caches are shared
+        self._cache_lock = threading.Lock()
+        self.index = None
+        self.db_dir = f"./data/{name}"
+        self.manifest_path = f"{self.db_dir}/manifest.json"
+        self.metadata_path = f"{self.db_dir}/metadata.jsonl"
+        self.query_cache_path = f"{self.db_dir}/query_cache.sqlite"
+        self.embeddings_path = f"{self.db_dir}/embeddings.npy"
+        self.embeddings_i8_path = f"{self.db_dir}/embeddings_i8.npy"
+        self.embeddings_bits_path = f"{self.db_dir}/embeddings_bits.npy"
+        self.index_path = f"{self.db_dir}/faiss.index"
+        self.legacy_db_path = f"{self.db_dir}/vector_db.pkl"
 
     def load_data(self, resume_file_path: str):
         """
@@ -36,18 +85,20 @@ class ResumeVectorDB:
         Args:
             resume_file_path: Path to the JSON file containing resume data
         """
-        if self.embeddings and self.metadata:
+        if len(self.embeddings) and self.metadata:
             print("Resume database is already loaded. Skipping data loading.")
             return
-        if os.path.exists(self.db_path):
+        stored_spec = self._stored_embedding_spec()
+        if stored_spec == EMBEDDING_SPEC:
             print("Loading resume database from disk.")
             self.load_db()
             return
+        if stored_spec is not None:
+            print(f"Resume database was embedded with {stored_spec}; rebuilding with {EMBEDDING_SPEC}.")
 
         # Load resume data
         print(f"Loading resume data from {resume_file_path}...")
-        with open(resume_file_path, 'r') as f:
-            resume_data = json.load(f)
+        resume_data = load_resume_file(resume_file_path)
         
         print(f"Found {len(resume_data)} candidates")
         
@@ -55,8 +106,8 @@ class ResumeVectorDB:
         chunks = process_resume_data(resume_data)
         
         # Extract texts and metadata
-        texts_to_embed = [chunk['content'] for chunk in chunks]
-        metadata = [chunk['metadata'] for chunk in chunks]
+        texts_to_embed = [chunk.content for chunk in chunks]
+        metadata = [chunk.metadata for chunk in chunks]
         
         print(f"Created {len(texts_to_embed)} searchable chunks")
         
@@ -74,17 +125,239 @@ class ResumeVectorDB:
             texts: List of text strings to embed
             data: List of corresponding metadata dictionaries
         """
-        batch_size = DEFAULT_BATCH_SIZE
-        with tqdm(total=len(texts), desc="Creating embeddings") as pbar:
-            result = []
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i : i + batch_size]
-                batch_result = self.client.embed(batch, model=EMBEDDING_MODEL).embeddings
-                result.extend(batch_result)
-                pbar.update(len(batch))
+        # Identical texts are embedded once, and never again on later builds
+        keys = [hashlib.sha256(f"{EMBEDDING_SPEC}\0{text}".encode()).digest() for text in texts]
+        cache = self._load_embedding_cache()
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cache:
+                missing[key] = text
+        missing_keys = list(missing)
+        missing_texts = list(missing.values())
+        if len(missing_texts) < len(texts):
+            print(f"Embedding {len(missing_texts)} new unique chunks; the other {len(texts) - len(missing_texts)} are cached or duplicates")
         
-        self.embeddings = result
+        try:
+            with tqdm(total=len(missing_texts), desc="Creating embeddings") as pbar:
+                with ThreadPoolExecutor(max_workers=EMBEDDING_MAX_WORKERS) as executor:
+                    futures = {
+                        executor.submit(self._embed_batch, [missing_texts[i] for i in indices]): indices
+                        for indices in self._token_batches(missing_texts)
+                    }
+                    for future in as_completed(futures):
+                        indices = futures[future]
+                        for i, embedding in zip(indices, future.result()):
+                            cache[missing_keys[i]] = np.asarray(embedding, dtype=np.int8 if EMBEDDING_DTYPE == "int8" else np.float32)
+                        pbar.update(len(indices))
+        finally:
+            # Flush even on failure so an interrupted build keeps its progress
+            if missing_keys:
+                self._save_embedding_cache(cache)
+        
+        # One contiguous, L2-normalized float32 matrix so search is a single SGEMV
+        self.embeddings = np.asarray([cache[key] for key in keys], dtype=np.float32)
+        self.embeddings /= np.linalg.norm(self.embeddings, axis=1, keepdims=True).clip(min=1e-12)
         self.metadata = data
+        self.contents = list(texts)
+        self._build_lookup()
+        self._quantize()
+        self._build_index()
+
+    @staticmethod
+    def _load_embedding_cache() -> Dict[bytes, np.ndarray]:
+        """Load the persistent text-hash -> embedding cache, if one exists."""
+        if not os.path.exists(EMBEDDING_CACHE_PATH):
+            return {}
+        with open(EMBEDDING_CACHE_PATH, "rb") as file:
+            return pickle.load(file)
+
+    @staticmethod
+    def _save_embedding_cache(cache: Dict[bytes, np.ndarray]):
+        """Atomically write the persistent embedding cache."""
+        os.makedirs(os.path.dirname(EMBEDDING_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{EMBEDDING_CACHE_PATH}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(cache, file)
+        os.replace(tmp_path, EMBEDDING_CACHE_PATH)
+
+    @staticmethod
+    def _token_batches(texts: List[str]) -> List[List[int]]:
+        """
+        Group texts into batches bounded by an approximate token budget.
+        
+        Texts are sorted by length so each batch holds similarly sized inputs;
+        tokens are estimated at ~4 characters each.
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            List of batches, each a list of indices into texts
+        """
+        batches = []
+        current, current_tokens = [], 0
+        for i in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+            tokens = len(texts[i]) // 4 + 1
+            if current and (current_tokens + tokens > MAX_BATCH_TOKENS or len(current) >= DEFAULT_BATCH_SIZE):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """
+        Embed one batch, retrying rate limits and transient errors with backoff.
+        
+        Args:
+            batch: Text strings to embed in a single API call
+            
+        Returns:
+            List of embedding vectors in the same order as batch
+        """
+        for attempt in range(EMBEDDING_MAX_RETRIES):
+            # Small jitter so concurrent workers don't hit the API in lockstep
+            time.sleep(random.uniform(0, 0.05))
+            try:
+                return self._embed(batch)
+            except (RateLimitError, ServiceUnavailableError, APIConnectionError) as e:
+                if attempt == EMBEDDING_MAX_RETRIES - 1:
+                    raise
+                try:
+                    delay = float(e.headers.get("retry-after"))
+                except (TypeError, ValueError):
+                    delay = 2 ** attempt
+                time.sleep(delay)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the configured model, output dimension and dtype."""
+        return self.client.embed(
+            texts, model=EMBEDDING_MODEL, output_dimension=EMBEDDING_DIM, output_dtype=EMBEDDING_DTYPE
+        ).embeddings
+
+    def _build_lookup(self):
+        """Index chunk metadata by candidate_id, and chunk rows by chunk, for O(1) lookups."""
+        by_cid = defaultdict(list)
+        chunk_rows = {}
+        for row, metadata in enumerate(self.metadata):
+            by_cid[metadata['candidate_id']].append(metadata)
+            chunk_rows.setdefault((metadata['candidate_id'], metadata['chunk_type'], chunk_index(metadata)), row)
+        self._by_cid = dict(by_cid)
+        self._chunk_index = chunk_rows
+
+    def get_candidate_metadata(self, candidate_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every chunk's metadata for a candidate, in database order.
+        
+        Args:
+            candidate_id: Candidate identifier
+            
+        Returns:
+            List of metadata dictionaries (empty if the candidate is unknown)
+        """
+        return self._by_cid.get(candidate_id, [])
+
+    def get_chunk_metadata(self, candidate_id: str, chunk_type: str, index: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of one chunk.
+        
+        Args:
+            candidate_id: Candidate identifier
+            chunk_type: 'position', 'education' or 'candidate_summary'
+            index: The chunk's index among the candidate's chunks of this type
+                (position_index for positions, education_index for education, 0 for summaries)
+            
+        Returns:
+            The chunk's metadata dictionary, or None if there is no such chunk
+        """
+        row = self.get_chunk_row(candidate_id, chunk_type, index)
+        return self.metadata[row] if row is not None else None
+
+    def get_chunk_row(self, candidate_id: str, chunk_type: str, index: int = 0) -> Optional[int]:
+        """
+        Get the row of one chunk in metadata, contents and the embedding matrix.
+        
+        Args:
+            candidate_id: Candidate identifier
+            chunk_type: 'position', 'education' or 'candidate_summary'
+            index: The chunk's index among the candidate's chunks of this type
+                (position_index for positions, education_index for education, 0 for summaries)
+            
+        Returns:
+            The chunk's row index, or None if there is no such chunk
+        """
+        return self._chunk_index.get((candidate_id, chunk_type, index))
+
+    def exact_search(self, text: str, field: Optional[str] = None, k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find chunks containing text, without embedding the query.
+        
+        Args:
+            text: Text to match (case-insensitive substring; exact for candidate_id, exact ignoring case for email)
+            field: Metadata key to match against, or None to match chunk content
+            k: Maximum number of results
+            
+        Returns:
+            List of search results in database order, each with similarity 1.0
+        """
+        if field == 'candidate_id':
+            rows = [i for i, metadata in enumerate(self.metadata) if metadata['candidate_id'] == text] \
+                if text in self._by_cid else []
+        elif field == 'email':
+            email = text.lower()
+            rows = (i for i, metadata in enumerate(self.metadata) if (metadata.get('email') or '').lower() == email)
+        else:
+            needle = text.lower()
+            rows = (
+                i for i, metadata in enumerate(self.metadata)
+                if needle in (str(metadata.get(field) or '') if field else self.contents[i]).lower()
+            )
+        
+        top_results = []
+        for idx in rows:
+            top_results.append({
+                "metadata": self.metadata[idx],
+                "similarity": 1.0,
+                "content": self.contents[idx]
+            })
+            if len(top_results) >= k:
+                break
+        
+        return top_results
+
+    def _quantize(self):
+        """Derive the int8 and sign-bit copies of the embedding matrix used for scoring."""
+        self.embeddings_bits = pack_sign_bits(self.embeddings) if len(self.embeddings) else None
+        if EMBEDDING_QUANTIZATION != "int8" or not len(self.embeddings):
+            self.embeddings_i8 = None
+            self.scale = 1.0
+            return
+        self.embeddings_i8, self.scale = quantize_int8(self.embeddings)
+
+    def _build_index(self):
+        """
+        Build a FAISS inner-product index over the stored embeddings, if FAISS is installed.
+        
+        Databases with at least HNSW_MIN_VECTORS chunks get an approximate HNSW
+        graph searched in roughly log(N); smaller ones keep an exact index.
+        """
+        if faiss is None or not len(self.embeddings):
+            self.index = None
+            return
+        dim = self.embeddings.shape[1]
+        matrix = np.ascontiguousarray(self.embeddings)
+        if len(matrix) >= HNSW_MIN_VECTORS:
+            self.index = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            self.index.hnsw.efSearch = HNSW_EF_SEARCH
+        elif EMBEDDING_QUANTIZATION == "int8":
+            self.index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            self.index.train(matrix)
+        else:
+            self.index = faiss.IndexFlatIP(dim)
+        self.index.add(matrix)
 
     def search(self, query: str, k: int = 20) -> List[Dict[str, Any]]:
         """
@@ -97,58 +370,376 @@ class ResumeVectorDB:
         Returns:
             List of search results with metadata and similarity scores
         """
-        if query in self.query_cache:
-            query_embedding = self.query_cache[query]
-        else:
-            query_embedding = self.client.embed([query], model=EMBEDDING_MODEL).embeddings[0]
-            self.query_cache[query] = query_embedding
-
-        if not self.embeddings:
+        if not len(self.embeddings):
             raise ValueError("No data loaded in the resume database.")
 
-        similarities = np.dot(self.embeddings, query_embedding)
-        top_indices = np.argsort(similarities)[::-1][:k]
+        # Repeat queries (including ones from past sessions) skip embedding and scoring
+        top_hits = self._cached_results(query, k)
+        if top_hits is None:
+            is_new_query = query not in self.query_cache
+            query_vector = self.embed_query(query)
+            new_embedding = self.query_cache[query] if is_new_query else None
+
+            new_recent = None
+            top_hits = self._lookup_recent(query_vector, k)
+            if top_hits is None:
+                top_hits = self._search_vectors(query_vector, k)
+                self._remember_recent(query_vector, top_hits)
+                new_recent = query_vector
+            with self._cache_lock:
+                self.results_cache[query] = top_hits
+                while len(self.results_cache) > QUERY_RESULTS_CACHE_SIZE:
+                    self.results_cache.popitem(last=False)
+            self._store_search(query, new_embedding, new_recent, top_hits)
         
         top_results = []
-        for idx in top_indices:
+        for idx, score in zip(*top_hits):
             result = {
                 "metadata": self.metadata[idx],
-                "similarity": float(similarities[idx]),
-                "content": get_content_from_metadata(self.metadata[idx])
+                "similarity": float(score),
+                "content": self.contents[idx]
             }
             top_results.append(result)
         
         return top_results
 
-    def get_content_from_metadata(self, metadata: Dict[str, Any]) -> str:
+    def _search_vectors(self, query_vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k stored embeddings most similar to a normalized query.
+        
+        Args:
+            query_vector: L2-normalized float32 query embedding
+            k: Number of top results to retrieve
+            
+        Returns:
+            Tuple of (row indices, similarity scores), best first
+        """
+        if self.index is not None:
+            scores, indices = self.index.search(query_vector[None, :], min(k, self.index.ntotal))
+            found = indices[0] != -1
+            return indices[0][found], scores[0][found]
+
+        rows = self._binary_shortlist(query_vector, k)
+        similarities = self._similarities(query_vector, rows)
+        top_indices = self._top_k_indices(similarities, k)
+        if rows is not None:
+            return rows[top_indices], similarities[top_indices]
+        return top_indices, similarities[top_indices]
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Get the L2-normalized embedding of a query, calling Voyage only for unseen queries.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Normalized float32 query embedding
+        """
+        if query not in self.query_cache:
+            self.query_cache[query] = self._embed([query])[0]
+        return self.cached_query_embedding(query)
+
+    def cached_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """
+        Get the L2-normalized embedding of a query that has already been embedded, never calling Voyage.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Normalized float32 query embedding, or None if the query isn't in the query cache
+        """
+        query_embedding = self.query_cache.get(query)
+        if query_embedding is None:
+            return None
+        query_vector = np.array(query_embedding, dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        return query_vector
+
+    def embed_queries(self, queries: List[str]):
+        """
+        Embed every query not yet in the query cache with a single Voyage request.
+        
+        Args:
+            queries: Query texts about to be searched
+        """
+        missing = [query for query in dict.fromkeys(queries) if query not in self.query_cache]
+        if not missing:
+            return
+        embeddings = self._embed(missing)
+        self.query_cache.update(zip(missing, embeddings))
+        with closing(self._connect_query_cache()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO queries VALUES (?, ?)",
+                ((query, _to_blob(embedding, np.float32)) for query, embedding in zip(missing, embeddings))
+            )
+
+    def _cached_results(self, query: str, k: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Reuse the stored results of an identical earlier query.
+        
+        Args:
+            query: Search query string
+            k: Number of top results needed
+            
+        Returns:
+            Tuple of (row indices, similarity scores) or None on a cache miss
+        """
+        with self._cache_lock:
+            hits = self.results_cache.get(query)
+            if hits is None:
+                return None
+            indices, scores = hits
+            if len(indices) < k and len(indices) < len(self.metadata):
+                return None
+            self.results_cache.move_to_end(query)
+        return indices[:k], scores[:k]
+
+    def _lookup_recent(self, query_vector: np.ndarray, k: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Reuse the results of a recent query whose embedding is nearly identical.
+        
+        Args:
+            query_vector: L2-normalized float32 query embedding
+            k: Number of top results needed
+            
+        Returns:
+            Tuple of (row indices, similarity scores) or None on a cache miss
+        """
+        with self._cache_lock:
+            recent_qembs, recent_results = self.recent_qembs, self.recent_results
+        if not len(recent_qembs):
+            return None
+        sims = recent_qembs @ query_vector
+        matches = np.flatnonzero(sims >= SEMANTIC_CACHE_THRESHOLD)
+        for i in matches[np.argsort(-sims[matches], kind="stable")]:
+            indices, scores = recent_results[i]
+            # Only reuse a cached search that returned at least k results (or everything)
+            if len(indices) >= k or len(indices) == len(self.metadata):
+                return indices[:k], scores[:k]
+        return None
+
+    def _remember_recent(self, query_vector: np.ndarray, top_hits: Tuple[np.ndarray, np.ndarray]):
+        """Add a query and its results to the semantic cache, evicting the oldest entry when full."""
+        if not SEMANTIC_CACHE_SIZE:
+            return
+        with self._cache_lock:
+            if len(self.recent_qembs):
+                self.recent_qembs = np.vstack([self.recent_qembs, query_vector[None, :]])[-SEMANTIC_CACHE_SIZE:]
+            else:
+                self.recent_qembs = query_vector[None, :].copy()
+            self.recent_results = (self.recent_results + [top_hits])[-SEMANTIC_CACHE_SIZE:]
+
+    @staticmethod
+    def _top_k_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+        """Return indices of the k highest similarities, best first, without a full sort."""
+        if k >= len(similarities):
+            return np.argsort(-similarities)
+        part = np.argpartition(-similarities, k - 1)[:k]
+        return part[np.argsort(-similarities[part])]
+
+    def _binary_shortlist(self, query_vector: np.ndarray, k: int) -> Optional[np.ndarray]:
+        """
+        Pick the rows closest to the query in Hamming space over sign bits.
+        
+        Args:
+            query_vector: L2-normalized float32 query embedding
+            k: Number of results the caller needs
+            
+        Returns:
+            Array of candidate row indices, or None to score every row
+        """
+        shortlist_size = max(BINARY_PREFILTER_SIZE, k)
+        if not BINARY_PREFILTER_SIZE or self.embeddings_bits is None or len(self.embeddings_bits) <= shortlist_size:
+            return None
+        distances = hamming_distances(self.embeddings_bits, pack_sign_bits(query_vector))
+        return np.argpartition(distances, shortlist_size - 1)[:shortlist_size]
+
+    def _similarities(self, query_vector: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        Reconstruct content from metadata for display.
+        Score a normalized query against the stored embeddings.
         
         Args:
-            metadata: Chunk metadata dictionary
+            query_vector: L2-normalized float32 query embedding
+            rows: Optional row indices to score (defaults to every chunk)
             
         Returns:
-            Reconstructed content string
+            Array of cosine similarities, one per scored row
         """
-        return get_content_from_metadata(metadata)
+        if self.embeddings_i8 is None:
+            matrix = self.embeddings if rows is None else self.embeddings[rows]
+            return float_matvec(matrix, query_vector)
+        matrix = self.embeddings_i8 if rows is None else self.embeddings_i8[rows]
+        query_i8, query_scale = quantize_int8(query_vector)
+        return int8_matvec(matrix, query_i8) / (self.scale * query_scale)
 
     def save_db(self):
-        """Save database to disk."""
-        data = {
-            "embeddings": self.embeddings,
-            "metadata": self.metadata,
-            "query_cache": json.dumps(self.query_cache),
-        }
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with open(self.db_path, "wb") as file:
-            pickle.dump(data, file)
+        """
+        Save database to disk.
+        
+        Embeddings are written as .npy files so they can be memory-mapped,
+        chunks as JSON lines and the query cache separately. The manifest is
+        written last and marks the database as complete.
+        """
+        os.makedirs(self.db_dir, exist_ok=True)
+        np.save(self.embeddings_path, self.embeddings)
+        if self.embeddings_i8 is not None:
+            np.save(self.embeddings_i8_path, self.embeddings_i8)
+        if self.embeddings_bits is not None:
+            np.save(self.embeddings_bits_path, self.embeddings_bits)
+        if self.index is not None:
+            faiss.write_index(self.index, self.index_path)
+        # Drop files a previous build left behind so they are never loaded against new embeddings
+        for path, value in ((self.embeddings_i8_path, self.embeddings_i8),
+                            (self.embeddings_bits_path, self.embeddings_bits),
+                            (self.index_path, self.index)):
+            if value is None and os.path.exists(path):
+                os.remove(path)
+        with open(self.metadata_path, "w") as file:
+            for content, metadata in zip(self.contents, self.metadata):
+                file.write(json.dumps({"content": content, "metadata": metadata}) + "\n")
+        self.save_query_cache()
+        with open(self.manifest_path, "w") as file:
+            json.dump({"embedding_model": EMBEDDING_SPEC, "count": len(self.metadata), "scale": self.scale}, file)
+
+    def _connect_query_cache(self) -> sqlite3.Connection:
+        """Open the query cache database, creating its tables if needed."""
+        os.makedirs(self.db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.query_cache_path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS queries (text TEXT PRIMARY KEY, embedding BLOB);
+            CREATE TABLE IF NOT EXISTS results (text TEXT PRIMARY KEY, indices BLOB, scores BLOB);
+            CREATE TABLE IF NOT EXISTS recent (id INTEGER PRIMARY KEY AUTOINCREMENT, embedding BLOB, indices BLOB, scores BLOB);
+        """)
+        return conn
+
+    def save_query_cache(self):
+        """Rewrite the whole query cache database from memory."""
+        with self._cache_lock:
+            queries = list(self.query_cache.items())
+            results = list(self.results_cache.items())
+            recent = list(zip(self.recent_qembs, self.recent_results))
+        with closing(self._connect_query_cache()) as conn, conn:
+            conn.execute("DELETE FROM queries")
+            conn.execute("DELETE FROM results")
+            conn.execute("DELETE FROM recent")
+            conn.executemany(
+                "INSERT INTO queries VALUES (?, ?)",
+                ((query, _to_blob(embedding, np.float32)) for query, embedding in queries)
+            )
+            conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?)",
+                ((query, _to_blob(indices, np.int64), _to_blob(scores, np.float32))
+                 for query, (indices, scores) in results)
+            )
+            conn.executemany(
+                "INSERT INTO recent (embedding, indices, scores) VALUES (?, ?, ?)",
+                ((_to_blob(embedding, np.float32), _to_blob(indices, np.int64), _to_blob(scores, np.float32))
+                 for embedding, (indices, scores) in recent)
+            )
+
+    def _store_search(self, query: str, query_embedding: Optional[List[float]], recent_vector: Optional[np.ndarray],
+                      top_hits: Tuple[np.ndarray, np.ndarray]):
+        """
+        Write one search's new cache entries without rewriting the rest of the cache.
+        
+        Args:
+            query: Search query string
+            query_embedding: Newly fetched query embedding, or None if it was already cached
+            recent_vector: Normalized query embedding added to the semantic cache, or None
+            top_hits: Tuple of (row indices, similarity scores) returned for the query
+        """
+        indices, scores = top_hits
+        hits = (_to_blob(indices, np.int64), _to_blob(scores, np.float32))
+        with closing(self._connect_query_cache()) as conn, conn:
+            if query_embedding is not None:
+                conn.execute("INSERT OR IGNORE INTO queries VALUES (?, ?)", (query, _to_blob(query_embedding, np.float32)))
+            # REPLACE gives the row a new rowid, so rowid order is least recently written first
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (query, *hits))
+            conn.execute(
+                "DELETE FROM results WHERE rowid NOT IN (SELECT rowid FROM results ORDER BY rowid DESC LIMIT ?)",
+                (QUERY_RESULTS_CACHE_SIZE,)
+            )
+            if recent_vector is not None:
+                conn.execute("INSERT INTO recent (embedding, indices, scores) VALUES (?, ?, ?)",
+                             (_to_blob(recent_vector, np.float32), *hits))
+                conn.execute(
+                    "DELETE FROM recent WHERE id NOT IN (SELECT id FROM recent ORDER BY id DESC LIMIT ?)",
+                    (SEMANTIC_CACHE_SIZE,)
+                )
+
+    def _stored_embedding_spec(self) -> Optional[str]:
+        """Return the embedding spec of the database on disk, or None if there is none."""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as file:
+                return json.load(file)["embedding_model"]
+        if os.path.exists(self.legacy_db_path):
+            return LEGACY_EMBEDDING_SPEC
+        return None
 
     def load_db(self):
-        """Load database from disk."""
-        if not os.path.exists(self.db_path):
+        """Load database from disk. Databases embedded with another EMBEDDING_SPEC must be rebuilt with load_data."""
+        stored_spec = self._stored_embedding_spec()
+        if stored_spec is None:
             raise ValueError("Resume database file not found. Use load_data to create a new database.")
-        with open(self.db_path, "rb") as file:
-            data = pickle.load(file)
-        self.embeddings = data["embeddings"]
-        self.metadata = data["metadata"]
-        self.query_cache = json.loads(data["query_cache"])
\ No newline at end of file
+        if stored_spec != EMBEDDING_SPEC:
+            # Vectors and cached query embeddings from another model can't be searched with this one
+            raise ValueError(f"Resume database was embedded with {stored_spec}, not {EMBEDDING_SPEC}. "
+                             "Use load_data to rebuild it.")
+        with open(self.manifest_path) as file:
+            manifest = json.load(file)
+
+        # Memory-map so cold start pages in only the rows search touches
+        self.embeddings = np.load(self.embeddings_path, mmap_mode='r')
+        self.contents, self.metadata = [], []
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(self.metadata_path, "rb") as file:
+            for line in file:
+                chunk = loads(line)
+                self.contents.append(chunk["content"])
+                self.metadata.append(chunk["metadata"])
+        self._build_lookup()
+        self._load_query_cache()
+
+        if EMBEDDING_QUANTIZATION == "int8" and os.path.exists(self.embeddings_i8_path):
+            self.embeddings_i8 = np.load(self.embeddings_i8_path, mmap_mode='r')
+            self.scale = manifest["scale"]
+        else:
+            self._quantize()
+        if os.path.exists(self.embeddings_bits_path):
+            self.embeddings_bits = np.load(self.embeddings_bits_path)
+        elif self.embeddings_bits is None:
+            self.embeddings_bits = pack_sign_bits(self.embeddings)
+        if faiss is not None and os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+            if isinstance(self.index, faiss.IndexHNSW):
+                self.index.hnsw.efSearch = HNSW_EF_SEARCH
+        else:
+            self._build_index()
+
+    def _load_query_cache(self):
+        """Load the query embedding cache, per-query results and recent query results, if saved."""
+        if not os.path.exists(self.query_cache_path):
+            return
+        with closing(self._connect_query_cache()) as conn:
+            self.query_cache = {
+                query: np.frombuffer(embedding, dtype=np.float32)
+                for query, embedding in conn.execute("SELECT text, embedding FROM queries")
+            }
+            self.results_cache = OrderedDict(
+                (query, (np.frombuffer(indices, dtype=np.int64), np.frombuffer(scores, dtype=np.float32)))
+                for query, indices, scores in conn.execute("SELECT text, indices, scores FROM results ORDER BY rowid")
+            )
+            recent = conn.execute("SELECT embedding, indices, scores FROM recent ORDER BY id").fetchall()
+        if recent:
+            self.recent_qembs = np.stack([np.frombuffer(embedding, dtype=np.float32) for embedding, _, _ in recent])
+            self.recent_results = [
+                (np.frombuffer(indices, dtype=np.int64), np.frombuffer(scores, dtype=np.float32))
+                for _, indices, scores in recent
+            ]
+
+
+def _to_blob(values, dtype) -> bytes:
+    """Serialize a vector to raw bytes for the query cache database."""
+    return np.asarray(values, dtype=dtype).tobytes()
@@ -5,21 +5,30 @@ Handles result display and formatting functions.
 """
 
 from typing import List, Dict, Any
+import sys
 import textwrap
 
+# Built once rather than per textwrap.fill call
+CONTENT_WRAPPER = textwrap.TextWrapper(width=76, initial_indent="      ", subsequent_indent="      ")
+SUMMARY_WRAPPER = textwrap.TextWrapper(width=76)
+
 
 def format_resume_results(results: List[Dict[str, Any]], query: str, show_full_content: bool = False) -> None:
     """
     Format and display resume search results.
     
+    Each result is assembled into one string and written with a single
+    sys.stdout.write, followed by one flush for the whole listing.
+    
     Args:
         results: List of search results
         query: Original search query
         show_full_content: Whether to show full content or preview
     """
-    print(f"\n🔍 Resume Search: '{query}'")
-    print(f"👥 Found {len(results)} matching candidates/positions:")
-    print("=" * 80)
+    write = sys.stdout.write
+    write(f"\n🔍 Resume Search: '{query}'\n"
+          f"👥 Found {len(results)} matching candidates/positions:\n"
+          f"{'=' * 80}\n")
     
     for i, result in enumerate(results, 1):
         metadata = result['metadata']
@@ -35,29 +44,42 @@ def format_resume_results(results: List[Dict[str, Any]], query: str, show_full_c
         
         # Different display based on chunk type
         if metadata['chunk_type'] == 'candidate_summary':
-            print(f"\n{i}. 👤 CANDIDATE PROFILE")
-            print(f"   📧 {metadata['name']} ({metadata['email']})")
-            print(f"   📍 {metadata['location']}")
-            print(f"   🎯 Stage: {metadata['stage']}")
-            print(f"   🔗 Similarity: {similarity:.4f}")
+            lines = [
+                f"\n{i}. 👤 CANDIDATE PROFILE",
+                f"   📧 {metadata['name']} ({metadata['email']})",
+                f"   📍 {metadata['location']}",
+                f"   🎯 Stage: {metadata['stage']}",
+                f"   🔗 Similarity: {similarity:.4f}",
+            ]
+        elif metadata['chunk_type'] == 'education':
+            lines = [
+                f"\n{i}. 🎓 EDUCATION",
+                f"   👤 {metadata['name']} ({metadata['email']})",
+                f"   🏫 {metadata['school_name']} - {metadata['degree']}",
+                f"   🔗 Similarity: {similarity:.4f}",
+            ]
         else:  # position
-            print(f"\n{i}. 💼 JOB EXPERIENCE")
-            print(f"   👤 {metadata['name']} ({metadata['email']})")
-            print(f"   🏢 {metadata['company']} - {metadata['title']}")
-            print(f"   📅 {metadata['start_date']} - {metadata['end_date']}")
-            print(f"   🔗 Similarity: {similarity:.4f}")
+            lines = [
+                f"\n{i}. 💼 JOB EXPERIENCE",
+                f"   👤 {metadata['name']} ({metadata['email']})",
+                f"   🏢 {metadata['company']} - {metadata['title']}",
+                f"   📅 {metadata['start_date']} - {metadata['end_date']}",
+                f"   🔗 Similarity: {similarity:.4f}",
+            ]
         
-        print(f"   📏 Content Length: {content_length} characters")
-        print(f"   📝 Details:")
+        lines.append(f"   📏 Content Length: {content_length} characters")
+        lines.append(f"   📝 Details:")
         
         # Format content with proper wrapping
-        wrapped_content = textwrap.fill(content_display, width=76, initial_indent="      ", subsequent_indent="      ")
-        print(wrapped_content)
+        lines.append(CONTENT_WRAPPER.fill(content_display))
         
         if not show_full_content and content_length > 300:
-            print(f"      ... ({content_length - 300} more characters)")
+            lines.append(f"      ... ({content_length - 300} more characters)")
         
-        print("-" * 80)
+        lines.append("-" * 80)
+        write("\n".join(lines) + "\n")
+    
+    sys.stdout.flush()
 
 
 def show_full_resume_result(results: List[Dict[str, Any]], result_number: int) -> None:
@@ -74,30 +96,45 @@ def show_full_resume_result(results: List[Dict[str, Any]], result_number: int) -
         content = result['content']
         similarity = result.get('similarity', result.get('score', 0))
         
-        print(f"\n📖 Full Details for Result #{result_number}:")
-        print("=" * 80)
+        lines = [
+            f"\n📖 Full Details for Result #{result_number}:",
+            "=" * 80,
+        ]
         
         if metadata['chunk_type'] == 'candidate_summary':
-            print(f"👤 CANDIDATE: {metadata['name']}")
-            print(f"📧 Email: {metadata['email']}")
-            print(f"📍 Location: {metadata['location']}")
-            print(f"🎯 Stage: {metadata['stage']}")
-            print(f"🔗 Similarity: {similarity:.4f}")
-            print(f"\n💼 Professional Summary:")
-            print(f"{metadata['headline']}")
+            lines += [
+                f"👤 CANDIDATE: {metadata['name']}",
+                f"📧 Email: {metadata['email']}",
+                f"📍 Location: {metadata['location']}",
+                f"🎯 Stage: {metadata['stage']}",
+                f"🔗 Similarity: {similarity:.4f}",
+                f"\n💼 Professional Summary:",
+                f"{metadata['headline']}",
+            ]
+        elif metadata['chunk_type'] == 'education':
+            lines += [
+                f"🎓 EDUCATION",
+                f"👤 Candidate: {metadata['name']} ({metadata['email']})",
+                f"🏫 School: {metadata['school_name']}",
+                f"📜 Degree: {metadata['degree']}",
+                f"🔗 Similarity: {similarity:.4f}",
+            ]
         else:
-            print(f"💼 JOB EXPERIENCE")
-            print(f"👤 Candidate: {metadata['name']} ({metadata['email']})")
-            print(f"🏢 Company: {metadata['company']}")
-            print(f"📋 Title: {metadata['title']}")
-            print(f"📅 Duration: {metadata['start_date']} - {metadata['end_date']}")
-            print(f"📍 Location: {metadata['location']}")
-            print(f"🔗 Similarity: {similarity:.4f}")
-            print(f"\n📝 Experience Details:")
-            print("-" * 40)
-            wrapped_summary = textwrap.fill(metadata['summary'], width=76)
-            print(wrapped_summary)
+            lines += [
+                f"💼 JOB EXPERIENCE",
+                f"👤 Candidate: {metadata['name']} ({metadata['email']})",
+                f"🏢 Company: {metadata['company']}",
+                f"📋 Title: {metadata['title']}",
+                f"📅 Duration: {metadata['start_date']} - {metadata['end_date']}",
+                f"📍 Location: {metadata['location']}",
+                f"🔗 Similarity: {similarity:.4f}",
+                f"\n📝 Experience Details:",
+                "-" * 40,
+                SUMMARY_WRAPPER.fill(metadata['summary']),
+            ]
         
-        print("=" * 80)
+        lines.append("=" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     else:
-        print(f"❌ Invalid result number. Please choose between 1 and {len(results)}.")
\ No newline at end of file
+        print(f"❌ Invalid result number. Please choose between 1 and {len(results)}.")
@@ -8,6 +8,18 @@ from resume_query.search import create_resume_bm25_index, retrieve_hybrid_resume
 from resume_query.formatting import format_resume_results, show_full_resume_result
 from resume_query.config import DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS
 
+# field:value prefixes accepted for literal lookups, mapped to chunk metadata keys
+LITERAL_FIELDS = {
+    'id': 'candidate_id',
+    'name': 'name',
+    'email': 'email',
+    'company': 'company',
+    'title': 'title',
+    'school': 'school_name',
+    'degree': 'degree',
+    'location': 'location',
+}
+
 
 def interactive_resume_query_loop(db) -> None:
     """
@@ -27,6 +39,7 @@ def interactive_resume_query_loop(db) -> None:
     print("   - Add 'full:' before your query to see full content")
     print("   - Add 'hybrid:' before your query for hybrid search (semantic + BM25)")
     print("   - Add 'bm25:' before your query for keyword-only search")
+    print("   - Use \"quotes\" or field:value (e.g. 'company:Google', 'email:jane@x.com') for exact lookups")
     print("   - Type a number (1-N) to see full details of that result")
     
     # Try to initialize BM25 search
@@ -144,6 +157,32 @@ def parse_user_input(user_input: str) -> tuple:
     return search_mode, query, k, show_full
 
 
+def parse_literal(query: str):
+    """
+    Detect literal lookups that gain nothing from semantic embedding.
+    
+    A query is literal when it is a quoted phrase, uses field:value syntax
+    (see LITERAL_FIELDS), or is an email address.
+    
+    Args:
+        query: Parsed search query
+        
+    Returns:
+        Tuple of (metadata field or None for full content, text) or None if not literal
+    """
+    if len(query) > 2 and query[0] == query[-1] == '"':
+        return None, query[1:-1].strip()
+    
+    field, sep, value = query.partition(':')
+    if sep and field.strip().lower() in LITERAL_FIELDS and value.strip():
+        return LITERAL_FIELDS[field.strip().lower()], value.strip()
+    
+    if ' ' not in query and '@' in query:
+        return 'email', query
+    
+    return None
+
+
 def perform_search(search_mode: str, query: str, k: int, show_full: bool, db, es_bm25):
     """
     Perform search based on the specified mode.
@@ -159,6 +198,18 @@ def perform_search(search_mode: str, query: str, k: int, show_full: bool, db, es
     Returns:
         List of search results
     """
+    # Literal lookups skip the embedding call. Fielded ones scan metadata exactly, since
+    # candidate_id and email aren't searchable in Elasticsearch; quoted phrases go to BM25 if available
+    literal = parse_literal(query) if search_mode in ("semantic", "hybrid") else None
+    if literal:
+        field, text = literal
+        if es_bm25 and field is None:
+            print("🔤 Literal query detected, using BM25 keyword search")
+            search_mode, query = "bm25", text
+        else:
+            print(f"🔎 Exact matching '{text}' (top {k} matches)...")
+            return db.exact_search(text, field=field, k=k)
+    
     if search_mode == "hybrid" and es_bm25:
         print(f"🔎 Hybrid searching for '{query}' (semantic + BM25, top {k} matches)...")
         if show_full:
@@ -178,9 +229,11 @@ def perform_search(search_mode: str, query: str, k: int, show_full: bool, db, es
         results = []
         for result in bm25_results:
             # Find corresponding metadata in the database
-            metadata = next((meta for meta in db.metadata 
-                           if meta['candidate_id'] == result['candidate_id']), None)
-            if metadata:
+            candidate_chunks = db.get_candidate_metadata(result['candidate_id'])
+            if candidate_chunks:
+                # Prefer the chunk of the same type as the BM25 hit
+                metadata = next((meta for meta in candidate_chunks
+                                 if meta['chunk_type'] == result['chunk_type']), candidate_chunks[0])
                 results.append({
                     'metadata': metadata,
                     'content': result['content'],
@@ -0,0 +1,50 @@
+"""
+Records Module
+
+Lightweight result types shared across the search pipeline.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator
+
+RERANK_FIELDS = ("rerank_score", "original_rank")
+
+
+@dataclass(slots=True, eq=False)
+class RerankedCandidate(Mapping):
+    """
+    A reranked search result that wraps the original candidate instead of copying it.
+
+    Reads like the candidate dict with 'rerank_score' and 'original_rank'
+    added, so existing callers can keep using result['key'] and result.get().
+    """
+    candidate: Dict[str, Any]
+    rerank_score: float
+    original_rank: int
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "rerank_score":
+            return self.rerank_score
+        if key == "original_rank":
+            return self.original_rank
+        return self.candidate[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (key for key in self.candidate if key not in RERANK_FIELDS)
+        yield from RERANK_FIELDS
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+@dataclass(slots=True, eq=False)
+class Chunk:
+    """
+    One searchable chunk: the text that is embedded plus the metadata shown with it.
+
+    metadata stays a dict because it is persisted to metadata.jsonl, indexed
+    into Elasticsearch, and its keys differ by chunk_type.
+    """
+    content: str
+    metadata: Dict[str, Any]
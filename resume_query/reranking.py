@@ -6,24 +6,141 @@ by reordering candidates based on deeper query-candidate relevance analysis.
 """
 
 import os
+import time
+import sqlite3
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import numpy as np
 import cohere
-from resume_query.config import COHERE_API_KEY
+from resume_query.records import RerankedCandidate
+from resume_query.config import (
+    COHERE_API_KEY, RERANK_MAX_WORKERS, RERANK_CHARS_PER_TOKEN, RERANK_CONTENT_CACHE_SIZE, RERANK_CACHE_ENABLED, RERANK_CACHE_SIZE, RERANK_MEMORY_CACHE_SIZE, RERANK_CACHE_TTL, RERANK_CACHE_PATH,
+    RERANK_SEMANTIC_CACHE_SIZE, RERANK_SEMANTIC_THRESHOLD, RERANK_OVERLAP_THRESHOLD
+)
 
 logger = logging.getLogger(__name__)
 
 
+class RerankScoreCache:
+    """
+    SQLite-backed cache of (query, document) rerank scores with a time-to-live.
+    
+    Recently used scores are also kept in a bounded in-memory LRU in front
+    of SQLite, so repeated lookups skip the database.
+    """
+    
+    def __init__(self, maxsize: int = RERANK_CACHE_SIZE, ttl: float = RERANK_CACHE_TTL,
+                 path: Optional[str] = RERANK_CACHE_PATH, memory_size: int = RERANK_MEMORY_CACHE_SIZE):
+        """
+        Open (or create) the score cache.
+        
+        Args:
+            maxsize: Maximum number of scores kept (oldest are evicted)
+            ttl: Seconds before a cached score expires
+            path: SQLite file used to persist scores across sessions (None to keep in memory)
+            memory_size: Maximum number of scores kept in the in-memory LRU tier
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.memory_size = memory_size
+        # key -> (score, timestamp), least recently used first
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS rr (k BLOB PRIMARY KEY, v REAL, ts REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS rr_ts ON rr (ts)")
+        self.save()
+    
+    @staticmethod
+    def make_key(model: str, query: str, document: str) -> bytes:
+        """Hash a (model, query, document) triple into a compact cache key."""
+        return hashlib.blake2b(f"{model}\0{query}\0{document}".encode(), digest_size=16).digest()
+    
+    def get_many(self, keys: List[bytes]) -> List[Optional[float]]:
+        """Return the cached score for each key, or None where missing or expired."""
+        found = {}
+        oldest = time.time() - self.ttl
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and entry[1] >= oldest:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[0]
+            remaining = [key for key in keys if key not in found]
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(remaining), 500):
+                batch = remaining[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT k, v, ts FROM rr WHERE ts >= ? AND k IN ({','.join('?' * len(batch))})",
+                    (oldest, *batch)
+                )
+                for key, score, ts in rows:
+                    found[key] = score
+                    self._remember(key, score, ts)
+        return [found.get(key) for key in keys]
+    
+    def set(self, key: bytes, score: float):
+        """Store a score; it is written to disk by the next save()."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO rr VALUES (?, ?, ?)", (key, score, now))
+            self._remember(key, score, now)
+    
+    def _remember(self, key: bytes, score: float, ts: float):
+        """Put a score in the in-memory tier, evicting the least recently used beyond memory_size."""
+        self._memory[key] = (score, ts)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def save(self):
+        """Commit pending scores, then drop expired ones and the oldest beyond maxsize."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM rr WHERE ts < ?", (time.time() - self.ttl,))
+            self._db.execute(
+                "DELETE FROM rr WHERE k IN (SELECT k FROM rr ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            )
+    
+    def clear(self):
+        """Remove every cached score."""
+        with self._lock, self._db:
+            self._memory.clear()
+            self._db.execute("DELETE FROM rr")
+    
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM rr").fetchone()[0]
+
+
 class CohereReranker:
     """Cohere-powered reranker for resume search results."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "rerank-v3.5"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "rerank-v3.5",
+                 score_cache: bool = RERANK_CACHE_ENABLED,
+                 embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+                 max_workers: int = RERANK_MAX_WORKERS):
         """
         Initialize the Cohere reranker.
         
         Args:
             api_key: Cohere API key (uses COHERE_API_KEY env var if None)
             model: Rerank model to use ('rerank-v3.5', 'rerank-english-v3.0', 'rerank-multilingual-v3.0')
+            score_cache: Whether to cache per-document rerank scores across calls and sessions
+            embed_fn: Query embedder (e.g. ResumeVectorDB.cached_query_embedding) enabling the
+                semantic query cache; it may return None for queries it has no embedding for.
+                Without it only exact (query, document) scores are reused
+            max_workers: Concurrent Cohere requests when documents span several requests
         """
         if api_key is None:
             api_key = COHERE_API_KEY
@@ -33,24 +150,34 @@ class CohereReranker:
         
         self.client = cohere.Client(api_key=api_key)
         self.model = model
-        self.cache = {}  # Simple query cache
+        self.embed_fn = embed_fn
+        self.max_workers = max_workers
+        # Semantic query cache: one row per recent query, paired with its {document: score} ranking
+        self.query_embeddings = np.empty((0, 0), dtype=np.float32)
+        self.cache_meta = []
+        self._semantic_lock = threading.Lock()
+        self.score_cache = RerankScoreCache() if score_cache else None
         
         # Model configurations
         self.model_configs = {
             "rerank-v3.5": {
                 "max_documents": 1000,
+                "max_tokens_per_doc": 4096,
                 "description": "Latest multilingual reranking with enhanced reasoning (recommended)"
             },
             "rerank-english-v3.0": {
                 "max_documents": 1000,
+                "max_tokens_per_doc": 4096,
                 "description": "High-quality English reranking"
             },
             "rerank-multilingual-v3.0": {
                 "max_documents": 1000,
+                "max_tokens_per_doc": 4096,
                 "description": "Multilingual reranking"
             },
             "rerank-english-v2.0": {
                 "max_documents": 1000,
+                "max_tokens_per_doc": 512,
                 "description": "English reranking v2"
             }
         }
@@ -69,6 +196,10 @@ class CohereReranker:
         """
         Rerank candidates using Voyage AI rerank API.
         
+        If reranking fails, the candidates are returned unchanged (truncated
+        to top_k) without a rerank_score; use rerank_search_results to find
+        out whether reranking happened.
+        
         Args:
             query: Search query string
             candidates: List of candidate dictionaries with 'content' field
@@ -81,72 +212,55 @@ class CohereReranker:
         if not candidates:
             return candidates
         
-        # Check cache
-        cache_key = f"{query}:{len(candidates)}:{self.model}"
-        if use_cache and cache_key in self.cache:
-            logger.debug(f"Using cached rerank results for query: {query}")
-            cached_indices = self.cache[cache_key]
-            return self._apply_cached_ranking(candidates, cached_indices, top_k)
-        
         try:
-            # Extract documents for reranking
-            documents = []
-            for candidate in candidates:
-                # Use content field, fallback to reconstructed content
-                content = candidate.get('content', '')
-                if not content and 'metadata' in candidate:
-                    content = self._reconstruct_content(candidate['metadata'])
-                documents.append(content)
-            
-            # Limit documents to model capacity
-            max_docs = self.model_configs[self.model]["max_documents"]
-            if len(documents) > max_docs:
-                logger.warning(f"Truncating {len(documents)} candidates to {max_docs} for reranking")
-                documents = documents[:max_docs]
-                candidates = candidates[:max_docs]
-            
-            logger.info(f"Reranking {len(documents)} candidates with {self.model}")
-            
-            # Call Cohere rerank API
-            rerank_result = self.client.rerank(
-                query=query,
-                documents=documents,
-                model=self.model,
-                top_n=top_k or len(documents)
-            )
-            
-            # Process results
-            reranked_candidates = []
-            result_indices = []
-            
-            for result in rerank_result.results:
-                original_candidate = candidates[result.index].copy()
-                original_candidate['rerank_score'] = result.relevance_score
-                original_candidate['original_rank'] = result.index
-                reranked_candidates.append(original_candidate)
-                result_indices.append(result.index)
-            
-            # Cache results
-            if use_cache:
-                self.cache[cache_key] = result_indices
-            
-            logger.info(f"Successfully reranked {len(reranked_candidates)} candidates")
-            return reranked_candidates
-            
+            return self._rerank(query, candidates, top_k, use_cache)
         except Exception as e:
             logger.error(f"Reranking failed with error: {e}")
             logger.warning("Falling back to original ranking")
-            
-            # Return original candidates with dummy rerank scores
-            fallback_candidates = []
-            for i, candidate in enumerate(candidates):
-                candidate_copy = candidate.copy()
-                candidate_copy['rerank_score'] = candidate.get('similarity', 1.0 - (i * 0.01))
-                candidate_copy['original_rank'] = i
-                fallback_candidates.append(candidate_copy)
-            
-            return fallback_candidates[:top_k] if top_k else fallback_candidates
+            return candidates[:top_k] if top_k else candidates
     
+    def _rerank(
+        self, 
+        query: str, 
+        candidates: List[Dict[str, Any]], 
+        top_k: Optional[int] = None,
+        use_cache: bool = True
+    ) -> List[RerankedCandidate]:
+        """Rerank candidates, raising if scoring fails."""
+        # Extract documents for reranking
+        documents = []
+        for candidate in candidates:
+            # Use content field, fallback to reconstructed content
+            content = candidate.get('content', '')
+            if not content and 'metadata' in candidate:
+                content = self._reconstruct_content(candidate['metadata'])
+            documents.append(content)
+        
+        # Reuse the ranking of a near-identical recent query over nearly the same documents
+        query_vector = self._embed_query(query) if use_cache else None
+        scores = self._lookup_semantic(query_vector, documents) if query_vector is not None else None
+        if scores is not None:
+            logger.debug(f"Using semantically cached rerank results for query: {query}")
+        else:
+            logger.info(f"Reranking {len(documents)} candidates with {self.model}")
+            # Score documents (Cohere is only called for pairs not in the score cache)
+            scores = self._score_documents(query, documents, use_cache)
+            if query_vector is not None:
+                self._remember_semantic(query_vector, documents, scores)
+        
+        ranked_indices = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+        if top_k:
+            ranked_indices = ranked_indices[:top_k]
+        
+        # Wrap only the returned candidates; the originals are not copied
+        reranked_candidates = [
+            RerankedCandidate(candidate=candidates[index], rerank_score=scores[index], original_rank=index)
+            for index in ranked_indices
+        ]
+        
+        logger.info(f"Successfully reranked {len(reranked_candidates)} candidates")
+        return reranked_candidates
+        
     def rerank_search_results(
         self, 
         query: str, 
@@ -164,7 +278,8 @@ class CohereReranker:
             return_top_k: Final number of results to return
             
         Returns:
-            Tuple of (reranked_results, rerank_metadata)
+            Tuple of (reranked_results, rerank_metadata); if reranking fails the
+            results come back in their original order with metadata['reranked'] False
         """
         if not search_results:
             return search_results, {'reranked': False, 'reason': 'No results to rerank'}
@@ -176,11 +291,13 @@ class CohereReranker:
         logger.info(f"Reranking top {len(candidates_to_rerank)} of {len(search_results)} results")
         
         # Perform reranking
-        reranked_candidates = self.rerank_candidates(
-            query=query,
-            candidates=candidates_to_rerank,
-            top_k=return_top_k
-        )
+        try:
+            reranked_candidates = self._rerank(query, candidates_to_rerank, return_top_k)
+        except Exception as e:
+            logger.error(f"Reranking failed with error: {e}")
+            logger.warning("Falling back to original ranking")
+            unchanged = search_results[:return_top_k] if return_top_k else search_results
+            return unchanged, {'reranked': False, 'reason': f'Reranking failed: {e}'}
         
         # Combine reranked results with remaining candidates
         if remaining_candidates and (not return_top_k or len(reranked_candidates) < return_top_k):
@@ -204,7 +321,7 @@ class CohereReranker:
         
         return final_results, rerank_metadata
     
-    def get_rerank_scores(self, query: str, documents: List[str]) -> List[float]:
+    def get_rerank_scores(self, query: str, documents: List[str]) -> Optional[List[float]]:
         """
         Get rerank scores for a list of documents without full candidate processing.
         
@@ -213,64 +330,165 @@ class CohereReranker:
             documents: List of document strings
             
         Returns:
-            List of relevance scores
+            List of relevance scores, or None if reranking failed and the
+            documents should keep their original order
         """
         try:
-            rerank_result = self.client.rerank(
-                query=query,
-                documents=documents,
-                model=self.model,
-                top_n=len(documents)
-            )
-            
-            # Create score array in original order
-            scores = [0.0] * len(documents)
-            for result in rerank_result.results:
-                scores[result.index] = result.relevance_score
-            
-            return scores
+            return self._score_documents(query, documents)
             
         except Exception as e:
             logger.error(f"Failed to get rerank scores: {e}")
-            # Return decreasing scores as fallback
-            return [1.0 - (i * 0.01) for i in range(len(documents))]
+            return None
     
-    def _apply_cached_ranking(
+    def _score_documents(
         self, 
-        candidates: List[Dict[str, Any]], 
-        cached_indices: List[int], 
-        top_k: Optional[int]
-    ) -> List[Dict[str, Any]]:
-        """Apply cached ranking indices to candidates."""
-        reranked = []
-        for i, original_index in enumerate(cached_indices):
-            if original_index < len(candidates):
-                candidate = candidates[original_index].copy()
-                candidate['rerank_score'] = 1.0 - (i * 0.01)  # Approximated score
-                candidate['original_rank'] = original_index
-                reranked.append(candidate)
+        query: str, 
+        documents: List[str], 
+        use_cache: bool = True
+    ) -> List[float]:
+        """
+        Get a rerank score for every document, in original order.
+        
+        Scores found in the score cache are reused; only the remaining
+        documents are sent to Cohere, and their scores are cached. Documents
+        beyond the model's per-request limit are split into requests sent
+        concurrently. Documents are truncated to the model's token window
+        before sending, duplicates are sent once, and empty documents
+        score 0.0 without a request.
         
-        return reranked[:top_k] if top_k else reranked
+        Args:
+            query: Search query
+            documents: List of document strings
+            use_cache: Whether to read and write the score cache
+            
+        Returns:
+            List of relevance scores aligned with documents
+        """
+        score_cache = self.score_cache if use_cache else None
+        documents = [self._truncate(document) for document in documents]
+        scores = [None] * len(documents)
+        keys = []
+        if score_cache is not None:
+            keys = [score_cache.make_key(self.model, query, document) for document in documents]
+            scores = score_cache.get_many(keys)
+        
+        # Identical documents (e.g. the same chunk reached by several retrieval paths) are sent once
+        missing = {}
+        for i, score in enumerate(scores):
+            if score is None:
+                if documents[i].strip():
+                    missing.setdefault(documents[i], []).append(i)
+                else:
+                    scores[i] = 0.0
+        if missing:
+            unique_documents = list(missing)
+            max_docs = self.model_configs[self.model]["max_documents"]
+            chunks = [unique_documents[start:start + max_docs] for start in range(0, len(unique_documents), max_docs)]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                futures = {executor.submit(self._rerank_chunk, query, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    for document, score in zip(chunk, future.result()):
+                        indices = missing[document]
+                        for index in indices:
+                            scores[index] = score
+                        if score_cache is not None:
+                            score_cache.set(keys[indices[0]], score)
+            if score_cache is not None:
+                score_cache.save()
+        else:
+            logger.debug(f"All {len(documents)} rerank scores served from cache for query: {query}")
+        
+        return scores
+    
+    def _rerank_chunk(self, query: str, documents: List[str]) -> List[float]:
+        """Score one request's worth of documents with Cohere, returning scores in input order."""
+        rerank_result = self.client.rerank(
+            query=query,
+            documents=documents,
+            model=self.model,
+            top_n=len(documents)
+        )
+        scores = [0.0] * len(documents)
+        for result in rerank_result.results:
+            scores[result.index] = result.relevance_score
+        return scores
+    
+    def _truncate(self, document: str) -> str:
+        """Cut a document to roughly the model's per-document token window."""
+        max_chars = self.model_configs[self.model]["max_tokens_per_doc"] * RERANK_CHARS_PER_TOKEN
+        return document[:max_chars]
+    
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Embed a query for the semantic cache, or return None if no embedding is available."""
+        if self.embed_fn is None:
+            return None
+        try:
+            embedding = self.embed_fn(query)
+        except Exception as e:
+            logger.warning(f"Could not embed query for the rerank cache: {e}")
+            return None
+        if embedding is None:
+            return None
+        query_vector = np.array(embedding, dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        return query_vector
+    
+    def _lookup_semantic(self, query_vector: np.ndarray, documents: List[str]) -> Optional[List[float]]:
+        """
+        Reuse scores from a recent, near-identical query over largely the same documents.
+        
+        A cached ranking is used when its query embedding is within
+        RERANK_SEMANTIC_THRESHOLD cosine of this one and its document set has
+        at least RERANK_OVERLAP_THRESHOLD Jaccard overlap with the current one.
+        Documents it never scored get 0.0, ranking them after the cached ones.
+        
+        Args:
+            query_vector: Normalized query embedding
+            documents: Documents to score
+            
+        Returns:
+            List of scores aligned with documents, or None on a cache miss
+        """
+        with self._semantic_lock:
+            query_embeddings, cache_meta = self.query_embeddings, self.cache_meta
+        if not len(query_embeddings) or query_embeddings.shape[1] != len(query_vector):
+            return None
+        current = set(documents)
+        sims = query_embeddings @ query_vector
+        matches = np.flatnonzero(sims >= RERANK_SEMANTIC_THRESHOLD)
+        for i in matches[np.argsort(-sims[matches], kind="stable")]:
+            cached_scores = cache_meta[i]
+            overlap = len(current & cached_scores.keys()) / len(current | cached_scores.keys())
+            if overlap >= RERANK_OVERLAP_THRESHOLD:
+                return [cached_scores.get(document, 0.0) for document in documents]
+        return None
+    
+    def _remember_semantic(self, query_vector: np.ndarray, documents: List[str], scores: List[float]):
+        """Add a query's scores to the semantic cache, evicting the oldest entry when full."""
+        if not RERANK_SEMANTIC_CACHE_SIZE:
+            return
+        with self._semantic_lock:
+            if len(self.query_embeddings) and self.query_embeddings.shape[1] == len(query_vector):
+                self.query_embeddings = np.vstack([self.query_embeddings, query_vector[None, :]])[-RERANK_SEMANTIC_CACHE_SIZE:]
+                self.cache_meta = (self.cache_meta + [dict(zip(documents, scores))])[-RERANK_SEMANTIC_CACHE_SIZE:]
+            else:
+                self.query_embeddings = query_vector[None, :].copy()
+                self.cache_meta = [dict(zip(documents, scores))]
     
     def _reconstruct_content(self, metadata: Dict[str, Any]) -> str:
         """Reconstruct content from metadata if content field is missing."""
-        if metadata.get('chunk_type') == 'candidate_summary':
-            return f"""Location: {metadata.get('location', '')}"""
-        elif metadata.get('chunk_type') == 'education':
-            return f"""School: {metadata.get('school_name', '')}
-Degree: {metadata.get('degree', '')}"""
-        else:  # position
-            return f"""Company: {metadata.get('company', '')}
-Title: {metadata.get('title', '')}
-Duration: {metadata.get('start_date', '')} - {metadata.get('end_date', '')}
-Location: {metadata.get('location', '')}
-
-Experience Details:
-{metadata.get('summary', '')}"""
+        chunk_type = metadata.get('chunk_type')
+        fields = CONTENT_FIELDS.get(chunk_type, CONTENT_FIELDS['position'])
+        return _format_content(chunk_type, tuple(metadata.get(field, '') for field in fields))
     
     def clear_cache(self):
         """Clear the reranking cache."""
-        self.cache.clear()
+        with self._semantic_lock:
+            self.query_embeddings = np.empty((0, 0), dtype=np.float32)
+            self.cache_meta = []
+        if self.score_cache is not None:
+            self.score_cache.clear()
         logger.info("Reranking cache cleared")
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -278,24 +496,56 @@ Experience Details:
         return {
             'model': self.model,
             'config': self.model_configs.get(self.model, {}),
-            'cache_size': len(self.cache)
+            'cache_size': len(self.cache_meta),
+            'score_cache_size': len(self.score_cache) if self.score_cache is not None else 0
         }
 
 
+# Metadata fields each chunk type's reconstructed content is built from
+CONTENT_FIELDS = {
+    'candidate_summary': ('location',),
+    'education': ('school_name', 'degree'),
+    'position': ('company', 'title', 'start_date', 'end_date', 'location', 'summary'),
+}
+
+
+@lru_cache(maxsize=RERANK_CONTENT_CACHE_SIZE)
+def _format_content(chunk_type: str, values: Tuple[str, ...]) -> str:
+    """Format reconstructed content, memoized on the chunk type and its field values."""
+    if chunk_type == 'candidate_summary':
+        location, = values
+        return f"""Location: {location}"""
+    elif chunk_type == 'education':
+        school_name, degree = values
+        return f"""School: {school_name}
+Degree: {degree}"""
+    else:  # position
+        company, title, start_date, end_date, location, summary = values
+        return f"""Company: {company}
+Title: {title}
+Duration: {start_date} - {end_date}
+Location: {location}
+
+Experience Details:
+{summary}"""
+
+
 # Convenience functions for easy integration
 
-def create_reranker(model: str = "rerank-v3.5") -> CohereReranker:
+def create_reranker(model: str = "rerank-v3.5",
+                    embed_fn: Optional[Callable[[str], np.ndarray]] = None) -> CohereReranker:
     """
     Create a CohereReranker instance with error handling.
     
     Args:
         model: Model to use for reranking
+        embed_fn: Optional query embedder enabling the semantic rerank cache; may return None
         
     Returns:
         CohereReranker instance or None if creation fails
     """
     try:
-        return CohereReranker(model=model)
+        return CohereReranker(model=model, embed_fn=embed_fn)
     except Exception as e:
         logger.error(f"Failed to create reranker: {e}")
         return None
@@ -4,14 +4,34 @@ Search Module
 Handles BM25, hybrid search, and search result processing.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import parallel_bulk
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; RRF scoring falls back to NumPy
+    njit = None
 
 from resume_query.config import (
     ELASTICSEARCH_HOST, DEFAULT_INDEX_NAME, DEFAULT_RECALL_SIZE,
-    DEFAULT_SEMANTIC_WEIGHT, DEFAULT_BM25_WEIGHT
+    DEFAULT_SEMANTIC_WEIGHT, DEFAULT_BM25_WEIGHT, BM25_BULK_THREADS, BM25_BULK_CHUNK_SIZE
+)
+from resume_query.data_processing import chunk_index
+
+BM25_FIELDS = ["content^2", "name^1.5", "company^1.5", "title^1.5", "summary^1.2"]
+# Stored once in Elasticsearch so searches only send the query parameters
+BM25_TEMPLATE_ID = "resume_bm25"
+BM25_TEMPLATE_SOURCE = (
+    '{"query": {"multi_match": {"query": {{#toJson}}q{{/toJson}}, '
+    f'"fields": {json.dumps(BM25_FIELDS)}, "type": "best_fields"}}}}, '
+    '"size": {{k}}}'
 )
+# Only the hit fields _parse_hits reads are returned
+BM25_FILTER_PATH = ["hits.hits._score", "hits.hits._source"]
 
 
 class ResumeElasticsearchBM25:
@@ -37,6 +57,7 @@ class ResumeElasticsearchBM25:
                     "name": {"type": "text", "analyzer": "english"},
                     "email": {"type": "keyword", "index": False},
                     "chunk_type": {"type": "keyword", "index": False},
+                    "chunk_index": {"type": "integer", "index": False},
                     "company": {"type": "text", "analyzer": "english"},
                     "title": {"type": "text", "analyzer": "english"},
                     "summary": {"type": "text", "analyzer": "english"},
@@ -46,6 +67,7 @@ class ResumeElasticsearchBM25:
         if not self.es_client.indices.exists(index=self.index_name):
             self.es_client.indices.create(index=self.index_name, body=index_settings)
             print(f"Created resume index: {self.index_name}")
+        self.es_client.put_script(id=BM25_TEMPLATE_ID, script={"lang": "mustache", "source": BM25_TEMPLATE_SOURCE})
 
     def index_documents(self, resume_chunks: List[Dict[str, Any]]):
         """
@@ -57,7 +79,16 @@ class ResumeElasticsearchBM25:
         Returns:
             Number of successfully indexed documents
         """
-        actions = []
+        # Actions are generated lazily and sent as overlapping bulk requests
+        success = 0
+        for ok, _ in parallel_bulk(self.es_client, self._index_actions(resume_chunks),
+                                   thread_count=BM25_BULK_THREADS, chunk_size=BM25_BULK_CHUNK_SIZE):
+            success += ok
+        self.es_client.indices.refresh(index=self.index_name)
+        return success
+
+    def _index_actions(self, resume_chunks: List[Dict[str, Any]]):
+        """Yield one bulk index action per resume chunk."""
         for i, chunk_meta in enumerate(resume_chunks):
             source_data = {
                 "content": chunk_meta.get('content', ''),
@@ -65,6 +96,7 @@ class ResumeElasticsearchBM25:
                 "name": chunk_meta.get('name', ''),
                 "email": chunk_meta.get('email', ''),
                 "chunk_type": chunk_meta.get('chunk_type', ''),
+                "chunk_index": chunk_index(chunk_meta),
             }
             
             # Add position-specific fields if available
@@ -75,51 +107,75 @@ class ResumeElasticsearchBM25:
                     "summary": chunk_meta.get('summary', ''),
                 })
             
-            actions.append({
+            yield {
                 "_index": self.index_name,
                 "_id": i,
                 "_source": source_data
-            })
-        
-        success, _ = bulk(self.es_client, actions)
-        self.es_client.indices.refresh(index=self.index_name)
-        return success
+            }
 
-    def search(self, query: str, k: int = 20) -> List[Dict[str, Any]]:
+    def search(self, query: str, k: int = 20, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Search resumes using BM25.
         
         Args:
             query: Search query string
             k: Number of results to return
+            refresh: Force an index refresh first to see writes made since the last
+                refresh (index_documents already refreshes once when it finishes)
             
         Returns:
             List of BM25 search results
         """
-        self.es_client.indices.refresh(index=self.index_name)
-        search_body = {
-            "query": {
-                "multi_match": {
-                    "query": query,
-                    "fields": ["content^2", "name^1.5", "company^1.5", "title^1.5", "summary^1.2"],
-                    "type": "best_fields"
-                }
-            },
-            "size": k,
-        }
-        response = self.es_client.search(index=self.index_name, body=search_body)
+        if refresh:
+            self.es_client.indices.refresh(index=self.index_name)
+        response = self.es_client.search_template(index=self.index_name, id=BM25_TEMPLATE_ID,
+                                                  params={"q": query, "k": k}, filter_path=BM25_FILTER_PATH)
+        return self._parse_hits(response)
+
+    def msearch(self, queries: List[str], k: int = 20) -> List[List[Dict[str, Any]]]:
+        """
+        Run several BM25 searches in a single Elasticsearch round trip.
+        
+        Args:
+            queries: Search query strings
+            k: Number of results to return per query
+            
+        Returns:
+            One list of BM25 search results per query, in query order
+        """
+        if not queries:
+            return []
+        searches = []
+        for query in queries:
+            searches.extend([{}, {"id": BM25_TEMPLATE_ID, "params": {"q": query, "k": k}}])
+        response = self.es_client.msearch_template(
+            index=self.index_name, search_templates=searches,
+            # status keeps every entry in responses even when its hits are filtered away
+            filter_path=[f"responses.{path}" for path in BM25_FILTER_PATH] + ["responses.status", "responses.error"]
+        )
+        for item in response["responses"]:
+            if "error" in item:
+                raise RuntimeError(f"BM25 msearch failed: {item['error']}")
+        return [self._parse_hits(item) for item in response["responses"]]
+
+    @staticmethod
+    def _parse_hits(response) -> List[Dict[str, Any]]:
+        """Convert an Elasticsearch search response into BM25 result dicts."""
         return [
             {
                 "candidate_id": hit["_source"]["candidate_id"],
                 "name": hit["_source"]["name"],
                 "email": hit["_source"]["email"],
                 "chunk_type": hit["_source"]["chunk_type"],
+                # Documents indexed before chunk_index was stored resolve to the candidate's first chunk of the type
+                "chunk_index": hit["_source"].get("chunk_index", 0),
                 "content": hit["_source"]["content"],
                 "score": hit["_score"],
                 "company": hit["_source"].get("company", ""),
                 "title": hit["_source"].get("title", ""),
             }
-            for hit in response["hits"]["hits"]
+            # filter_path drops "hits" entirely when nothing matched
+            for hit in response.get("hits", {}).get("hits", [])
         ]
 
 
@@ -157,55 +213,107 @@ def retrieve_hybrid_resume(query: str, db, es_bm25: ResumeElasticsearchBM25, k:
     """
     num_chunks_to_recall = min(DEFAULT_RECALL_SIZE, len(db.metadata))
 
-    # Semantic search
-    semantic_results = db.search(query, k=num_chunks_to_recall)
-    semantic_chunk_ids = [(result['metadata']['candidate_id'], result['metadata'].get('position_index', 0), result['metadata']['chunk_type']) 
-                         for result in semantic_results]
+    # Both legs are independent network calls, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        semantic_future = executor.submit(db.search, query, k=num_chunks_to_recall)
+        bm25_future = executor.submit(es_bm25.search, query, k=num_chunks_to_recall)
+        semantic_results, bm25_results = semantic_future.result(), bm25_future.result()
 
-    # BM25 search
-    bm25_results = es_bm25.search(query, k=num_chunks_to_recall)
-    bm25_chunk_ids = [(result['candidate_id'], 0, result['chunk_type']) for result in bm25_results]
+    return _fuse_hybrid_results(db, semantic_results, bm25_results, k, semantic_weight, bm25_weight)
 
-    # Combine and score results
-    all_chunk_ids = list(set(semantic_chunk_ids + bm25_chunk_ids))
-    chunk_id_to_score = {}
+
+def retrieve_hybrid_resume_batch(queries: List[str], db, es_bm25: ResumeElasticsearchBM25, k: int,
+                                 semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT,
+                                 bm25_weight: float = DEFAULT_BM25_WEIGHT) -> List[Tuple[List[Dict[str, Any]], float, float]]:
+    """
+    Perform hybrid search for several queries with batched network calls.
+    
+    All BM25 searches go out as one Elasticsearch msearch request while the
+    semantic leg embeds every uncached query in one Voyage request.
+    
+    Args:
+        queries: Search queries
+        db: ResumeVectorDB instance
+        es_bm25: ResumeElasticsearchBM25 instance
+        k: Number of final results to return per query
+        semantic_weight: Weight for semantic search results
+        bm25_weight: Weight for BM25 search results
+        
+    Returns:
+        One (final_results, semantic_count, bm25_count) tuple per query, in query order
+    """
+    num_chunks_to_recall = min(DEFAULT_RECALL_SIZE, len(db.metadata))
+
+    def semantic_leg():
+        db.embed_queries(queries)
+        return [db.search(query, k=num_chunks_to_recall) for query in queries]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        semantic_future = executor.submit(semantic_leg)
+        bm25_future = executor.submit(es_bm25.msearch, queries, k=num_chunks_to_recall)
+        semantic_batches, bm25_batches = semantic_future.result(), bm25_future.result()
+
+    return [
+        _fuse_hybrid_results(db, semantic_results, bm25_results, k, semantic_weight, bm25_weight)
+        for semantic_results, bm25_results in zip(semantic_batches, bm25_batches)
+    ]
+
+
+def _fuse_hybrid_results(db, semantic_results: List[Dict[str, Any]], bm25_results: List[Dict[str, Any]], k: int,
+                         semantic_weight: float, bm25_weight: float):
+    """
+    Combine semantic and BM25 rankings into one weighted reciprocal-rank list.
+    
+    Args:
+        db: ResumeVectorDB instance
+        semantic_results: Results from db.search
+        bm25_results: Results from ResumeElasticsearchBM25.search
+        k: Number of final results to return
+        semantic_weight: Weight for semantic search results
+        bm25_weight: Weight for BM25 search results
+        
+    Returns:
+        Tuple of (final_results, semantic_count, bm25_count)
+    """
+    semantic_chunk_ids = [(result['metadata']['candidate_id'], chunk_index(result['metadata']), result['metadata']['chunk_type'])
+                         for result in semantic_results]
+    bm25_chunk_ids = [(result['candidate_id'], result['chunk_index'], result['chunk_type']) for result in bm25_results]
+
+    # Number chunk ids densely so both rankings can be scored as arrays
+    id_to_int = {}
+    semantic_ids = np.array([id_to_int.setdefault(chunk_id, len(id_to_int)) for chunk_id in semantic_chunk_ids], dtype=np.int64)
+    bm25_ids = np.array([id_to_int.setdefault(chunk_id, len(id_to_int)) for chunk_id in bm25_chunk_ids], dtype=np.int64)
+    chunk_ids = list(id_to_int)
 
     # Score chunks based on ranking in each search method
-    for chunk_id in all_chunk_ids:
-        score = 0
-        if chunk_id in semantic_chunk_ids:
-            index = semantic_chunk_ids.index(chunk_id)
-            score += semantic_weight * (1 / (index + 1))
-        if chunk_id in bm25_chunk_ids:
-            index = bm25_chunk_ids.index(chunk_id)
-            score += bm25_weight * (1 / (index + 1))
-        chunk_id_to_score[chunk_id] = score
+    scores = _rrf_scores(semantic_ids, bm25_ids, len(chunk_ids), semantic_weight, bm25_weight)
+    in_semantic = np.zeros(len(chunk_ids), dtype=bool)
+    in_semantic[semantic_ids] = True
+    in_bm25 = np.zeros(len(chunk_ids), dtype=bool)
+    in_bm25[bm25_ids] = True
 
     # Sort by combined score
-    sorted_chunk_ids = sorted(chunk_id_to_score.keys(), 
-                             key=lambda x: chunk_id_to_score[x], reverse=True)
+    order = np.argsort(-scores, kind="stable")
 
     # Prepare final results
     final_results = []
     semantic_count = 0
     bm25_count = 0
     
-    for chunk_id in sorted_chunk_ids[:k]:
-        candidate_id, pos_idx, chunk_type = chunk_id
+    for i in order[:k]:
+        candidate_id, index, chunk_type = chunk_ids[i]
         
-        # Find the corresponding metadata
-        chunk_metadata = next((meta for meta in db.metadata 
-                              if meta['candidate_id'] == candidate_id and 
-                              meta['chunk_type'] == chunk_type), None)
+        # Find the chunk's row, which holds the same stored content semantic search returns
+        row = db.get_chunk_row(candidate_id, chunk_type, index)
         
-        if chunk_metadata:
-            is_from_semantic = chunk_id in semantic_chunk_ids
-            is_from_bm25 = chunk_id in bm25_chunk_ids
+        if row is not None:
+            is_from_semantic = bool(in_semantic[i])
+            is_from_bm25 = bool(in_bm25[i])
             
             final_results.append({
-                'metadata': chunk_metadata,
-                'content': db.get_content_from_metadata(chunk_metadata),
-                'score': chunk_id_to_score[chunk_id],
+                'metadata': db.metadata[row],
+                'content': db.contents[row],
+                'score': float(scores[i]),
                 'from_semantic': is_from_semantic,
                 'from_bm25': is_from_bm25
             })
@@ -218,4 +326,53 @@ def retrieve_hybrid_resume(query: str, db, es_bm25: ResumeElasticsearchBM25, k:
                 semantic_count += 0.5
                 bm25_count += 0.5
 
-    return final_results, semantic_count, bm25_count
\ No newline at end of file
+    return final_results, semantic_count, bm25_count
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _rrf_scores_jit(semantic_ids, bm25_ids, n_chunks, semantic_weight, bm25_weight):
+        scores = np.zeros(n_chunks)
+        seen = np.zeros(n_chunks, dtype=np.bool_)
+        for i in range(semantic_ids.size):
+            chunk = semantic_ids[i]
+            if not seen[chunk]:
+                seen[chunk] = True
+                scores[chunk] += semantic_weight * (1.0 / (i + 1))
+        seen[:] = False
+        for i in range(bm25_ids.size):
+            chunk = bm25_ids[i]
+            if not seen[chunk]:
+                seen[chunk] = True
+                scores[chunk] += bm25_weight * (1.0 / (i + 1))
+        return scores
+else:
+    _rrf_scores_jit = None
+
+
+def _rrf_scores(semantic_ids: np.ndarray, bm25_ids: np.ndarray, n_chunks: int,
+                semantic_weight: float, bm25_weight: float) -> np.ndarray:
+    """
+    Weighted reciprocal-rank score of every chunk.
+    
+    Only a chunk's first (best) rank in each list counts. With numba the
+    scoring is a single compiled pass over both rankings.
+    
+    Args:
+        semantic_ids: Dense chunk ids in semantic rank order
+        bm25_ids: Dense chunk ids in BM25 rank order
+        n_chunks: Number of distinct chunk ids
+        semantic_weight: Weight for semantic search results
+        bm25_weight: Weight for BM25 search results
+        
+    Returns:
+        (n_chunks,) array of combined scores
+    """
+    if _rrf_scores_jit is not None:
+        return _rrf_scores_jit(semantic_ids, bm25_ids, n_chunks, float(semantic_weight), float(bm25_weight))
+    
+    scores = np.zeros(n_chunks)
+    for ids, weight in ((semantic_ids, semantic_weight), (bm25_ids, bm25_weight)):
+        unique_ids, first_ranks = np.unique(ids, return_index=True)
+        scores[unique_ids] += weight * (1 / (first_ranks + 1))
+    return scores
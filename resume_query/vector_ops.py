@@ -0,0 +1,146 @@
+"""
+Vector Operations Module
+
+Low-level NumPy kernels used by the vector database for scoring embeddings.
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; kernels fall back to blockwise NumPy
+    njit = prange = None
+
+# Rows upcast per block when scoring int8 embeddings without numba
+INT8_BLOCK_ROWS = 4096
+# Rows per tile when scoring float32 embeddings (1024 x 1024-D fp32 = 4MB, roughly L2-sized)
+FLOAT_BLOCK_ROWS = 1024
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Symmetrically quantize float vectors to int8 with a single scale.
+
+    Args:
+        vectors: Float array (any shape) to quantize
+
+    Returns:
+        Tuple of (int8 array, scale) where vectors ≈ int8 / scale
+    """
+    peak = float(np.abs(vectors).max()) if vectors.size else 0.0
+    scale = 127.0 / peak if peak else 1.0
+    quantized = np.clip(np.rint(vectors * scale), -127, 127).astype(np.int8)
+    return quantized, scale
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _int8_matvec(matrix, query):
+        out = np.empty(matrix.shape[0], dtype=np.int32)
+        for i in range(matrix.shape[0]):
+            acc = np.int32(0)
+            for j in range(matrix.shape[1]):
+                acc += np.int32(matrix[i, j]) * np.int32(query[j])
+            out[i] = acc
+        return out
+else:
+    _int8_matvec = None
+
+
+def int8_matvec(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Compute raw int8 dot products between every row of matrix and query.
+
+    Args:
+        matrix: (N, D) int8 embedding matrix
+        query: (D,) int8 query vector
+
+    Returns:
+        (N,) array of integer-valued dot products
+    """
+    if _int8_matvec is not None:
+        return _int8_matvec(matrix, query)
+
+    # NumPy has no int8 GEMV with a wide accumulator, so upcast one
+    # cache-sized block at a time instead of the whole matrix
+    out = np.empty(matrix.shape[0], dtype=np.float32)
+    query_f32 = query.astype(np.float32)
+    for start in range(0, matrix.shape[0], INT8_BLOCK_ROWS):
+        block = matrix[start:start + INT8_BLOCK_ROWS]
+        out[start:start + len(block)] = block.astype(np.float32) @ query_f32
+    return out
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _float_matvec(matrix, query):
+        n_rows = matrix.shape[0]
+        out = np.empty(n_rows, dtype=np.float32)
+        for tile in prange((n_rows + FLOAT_BLOCK_ROWS - 1) // FLOAT_BLOCK_ROWS):
+            start = tile * FLOAT_BLOCK_ROWS
+            for i in range(start, min(start + FLOAT_BLOCK_ROWS, n_rows)):
+                acc = np.float32(0.0)
+                for j in range(matrix.shape[1]):
+                    acc += matrix[i, j] * query[j]
+                out[i] = acc
+        return out
+else:
+    _float_matvec = None
+
+
+def float_matvec(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Compute dot products between every row of a float32 matrix and query, one tile at a time.
+
+    Each tile of FLOAT_BLOCK_ROWS rows is scored while it and the query are
+    still in cache, so large or memory-mapped matrices stream through once.
+    With numba, tiles are scored in parallel across cores.
+
+    Args:
+        matrix: (N, D) float32 embedding matrix (may be memory-mapped)
+        query: (D,) float32 query vector
+
+    Returns:
+        (N,) float32 array of dot products
+    """
+    matrix = np.asarray(matrix)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    if _float_matvec is not None and matrix.dtype == np.float32 and matrix.flags.c_contiguous:
+        return _float_matvec(matrix, query)
+
+    out = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], FLOAT_BLOCK_ROWS):
+        block = matrix[start:start + FLOAT_BLOCK_ROWS]
+        out[start:start + len(block)] = block @ query
+    return out
+
+
+def pack_sign_bits(vectors: np.ndarray) -> np.ndarray:
+    """
+    Pack the sign of each dimension into bits (1 bit per dimension).
+
+    Args:
+        vectors: (N, D) or (D,) float or int8 array
+
+    Returns:
+        uint8 array of shape (N, ceil(D/8)) or (ceil(D/8),)
+    """
+    return np.packbits(vectors > 0, axis=-1)
+
+
+def hamming_distances(bits: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance between every packed row of bits and the packed query.
+
+    Args:
+        bits: (N, B) uint8 packed sign bits
+        query_bits: (B,) uint8 packed query sign bits
+
+    Returns:
+        (N,) int32 array of differing bit counts
+    """
+    xor = np.bitwise_xor(bits, query_bits)
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0 lowers this to POPCNT
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+    return np.unpackbits(xor, axis=1).sum(axis=1, dtype=np.int32)
@@ -0,0 +1,57 @@
+"""
+Test helpers: an offline Voyage client and a small on-disk resume database.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from resume_query.database import ResumeVectorDB
+
+
+class FakeVoyageClient:
+    """Stands in for voyageai.Client with deterministic, text-seeded embeddings."""
+
+    class _Result:
+        def __init__(self, embeddings):
+            self.embeddings = embeddings
+
+    def embed(self, texts, model=None, input_type=None, output_dtype=None, output_dimension=None, **kwargs):
+        embeddings = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+            vector = np.random.default_rng(seed).standard_normal(output_dimension or 256)
+            if output_dtype == "int8":
+                vector = np.round(vector * 127 / np.abs(vector).max())
+            embeddings.append(vector.tolist())
+        return self._Result(embeddings)
+
+
+def build_db(test_case, candidates) -> ResumeVectorDB:
+    """Build a ResumeVectorDB over candidates in a temporary working directory removed after the test."""
+    tmp = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp.cleanup)
+    cwd = os.getcwd()
+    os.chdir(tmp.name)
+    test_case.addCleanup(os.chdir, cwd)
+    path = os.path.join(tmp.name, "candidates.json")
+    with open(path, "w") as file:
+        json.dump(candidates, file)
+    db = ResumeVectorDB("test", api_key="test")
+    db.client = FakeVoyageClient()
+    db.load_data(path)
+    return db
+
+
+def candidate(candidate_id, email, positions=(), schools=()):
+    """A candidate record shaped like candidates_with_parsed_resumes.json."""
+    return {
+        "candidate_id": candidate_id, "name": f"Name {candidate_id}", "email": email,
+        "location": "", "headline": "", "stage": "new",
+        "parsed_resume": {
+            "positions": [{"org": org, "title": title, "summary": "", "start": {"year": 2020}}
+                          for org, title in positions],
+            "schools": [{"org": org, "degree": degree} for org, degree in schools],
+        },
+    }
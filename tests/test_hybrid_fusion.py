@@ -0,0 +1,37 @@
+import contextlib
+import io
+import unittest
+from resume_query.search import _fuse_hybrid_results
+from tests.helpers import build_db, candidate
+
+
+class HybridFusionTest(unittest.TestCase):
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.db = build_db(self, [
+                candidate("c1", "ann@x.com", positions=[("Acme", "Engineer")],
+                          schools=[("Stanford", "BS"), ("MIT", "PhD")]),
+            ])
+
+    def test_each_education_entry_keeps_its_own_row(self):
+        semantic_results = self.db.search("schools", k=len(self.db.metadata))
+        bm25_results = [{"candidate_id": "c1", "chunk_type": "education", "chunk_index": 1, "score": 3.0}]
+
+        results, _, _ = _fuse_hybrid_results(self.db, semantic_results, bm25_results, 10, 0.8, 0.2)
+
+        education = {r["metadata"]["school_name"]: r for r in results if r["metadata"]["chunk_type"] == "education"}
+        self.assertEqual(set(education), {"Stanford", "MIT"})
+        self.assertEqual(education["MIT"]["content"], "School: MIT\nDegree: PhD")
+        self.assertEqual(education["Stanford"]["content"], "School: Stanford\nDegree: BS")
+        self.assertTrue(education["MIT"]["from_bm25"])
+        self.assertFalse(education["Stanford"]["from_bm25"])
+
+    def test_chunk_lookup_reaches_every_education_entry(self):
+        self.assertEqual(self.db.get_chunk_metadata("c1", "education", 0)["school_name"], "Stanford")
+        self.assertEqual(self.db.get_chunk_metadata("c1", "education", 1)["school_name"], "MIT")
+        self.assertEqual(self.db.contents[self.db.get_chunk_row("c1", "education", 1)], "School: MIT\nDegree: PhD")
+        self.assertIsNone(self.db.get_chunk_row("c1", "education", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
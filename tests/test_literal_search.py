@@ -0,0 +1,38 @@
+import contextlib
+import io
+import unittest
+from resume_query.formatting import format_resume_results
+from resume_query.interactive import perform_search
+from tests.helpers import build_db, candidate
+
+
+class LiteralSearchTest(unittest.TestCase):
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.db = build_db(self, [
+                candidate("c1", "ann@x.com", positions=[("Acme", "Engineer")], schools=[("Stanford", "BS")]),
+                candidate("c2", "dan@x.com", positions=[("Initech", "Analyst")], schools=[("MIT", "MS")]),
+            ])
+
+    def test_school_query_end_to_end(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            results = perform_search("semantic", "school:Stan", 5, False, self.db, None)
+            format_resume_results(results, "school:Stan")
+        self.assertEqual([r["metadata"]["candidate_id"] for r in results], ["c1"])
+        self.assertIn("🎓 EDUCATION", out.getvalue())
+        self.assertIn("Stanford - BS", out.getvalue())
+
+    def test_email_lookup_is_exact(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = perform_search("semantic", "ANN@x.com", 5, False, self.db, None)
+        self.assertEqual({r["metadata"]["candidate_id"] for r in results}, {"c1"})
+
+    def test_email_lookup_does_not_match_substrings(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(perform_search("semantic", "an@x.com", 5, False, self.db, None), [])
+            self.assertEqual(perform_search("semantic", "email:n@x.com", 5, False, self.db, None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
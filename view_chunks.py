@@ -7,9 +7,57 @@ without running the full RAG system. Useful for debugging and understanding
 the data processing pipeline.
 """
 
+import sys
 import json
 import argparse
-from resume_query.data_processing import process_resume_data
+import itertools
+import multiprocessing
+from collections import ChainMap, Counter
+
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:  # yajl2_c needs a compiled ijson; fall back to whichever backend is available
+    try:
+        import ijson
+    except ImportError:  # ijson is optional; the whole file is parsed instead
+        ijson = None
+JSON_ERRORS = (json.JSONDecodeError, ijson.common.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+# Bytes handed to the streaming parser per read
+READ_BUFFER_SIZE = 1 << 20
+# Key metadata shown for each chunk type, with the placeholder used when a field is missing
+SUMMARY_METADATA = (
+    "   Candidate: {name}\n"
+    "   Email: {email}\n"
+    "   Location: {location}\n"
+    "   Stage: {stage}"
+)
+EDUCATION_METADATA = (
+    "   Candidate: {name}\n"
+    "   School: {school_name}\n"
+    "   Degree: {degree}\n"
+    "   Education Index: {education_index}"
+)
+POSITION_METADATA = (
+    "   Candidate: {name}\n"
+    "   Company: {company}\n"
+    "   Title: {title}\n"
+    "   Duration: {start_date} - {end_date}\n"
+    "   Position Index: {position_index}"
+)
+CHUNK_DISPLAY = {
+    'candidate_summary': ("📋", SUMMARY_METADATA),
+    'education': ("🎓", EDUCATION_METADATA),
+    'position': ("💼", POSITION_METADATA),
+}
+METADATA_DEFAULTS = {
+    'name': 'Unknown', 'email': 'No email', 'location': 'No location', 'stage': 'No stage',
+    'school_name': 'Unknown', 'degree': 'Unknown', 'education_index': 'N/A',
+    'company': 'Unknown', 'title': 'Unknown', 'start_date': '', 'end_date': '', 'position_index': 'N/A',
+}
+
+# Previews this small are chunked serially; a process pool would cost more to start than it saves
+SERIAL_MAX_CANDIDATES = 4
 
 
 def view_chunks(resume_file: str, max_candidates: int = 3, max_chunks_per_candidate: int = 5):
@@ -28,105 +76,80 @@ def view_chunks(resume_file: str, max_candidates: int = 3, max_chunks_per_candid
     try:
         # Load resume data
         print(f"📄 Loading resume data from: {resume_file}")
-        with open(resume_file, 'r') as f:
-            resume_data = json.load(f)
-        
-        print(f"✅ Loaded {len(resume_data)} total candidates")
-        
-        # Limit to first N candidates for viewing
-        candidates_to_process = resume_data[:max_candidates]
+        if ijson is not None:
+            if ijson.backend != 'yajl2_c':
+                print(f"💡 ijson is using its slower {ijson.backend} backend; `pip install cffi yajl` enables the C parser")
+            # Decode only the candidates being previewed; use_float skips Decimal construction
+            with open(resume_file, 'rb') as f:
+                candidates = ijson.items(f, 'item', use_float=True, buf_size=READ_BUFFER_SIZE)
+                candidates_to_process = list(itertools.islice(candidates, max_candidates))
+            print(f"✅ Loaded first {len(candidates_to_process)} candidates (of ?, streamed)")
+        else:
+            # Imported here so --help doesn't pay for loading the resume_query package
+            from resume_query.data_processing import load_resume_file
+            resume_data = load_resume_file(resume_file)
+            
+            print(f"✅ Loaded {len(resume_data)} total candidates")
+            
+            # Limit to first N candidates for viewing
+            candidates_to_process = resume_data[:max_candidates]
         print(f"🎯 Processing first {len(candidates_to_process)} candidates for preview")
         print()
         
-        # Process into chunks
-        chunks = process_resume_data(candidates_to_process)
+        # Chunks are generated and displayed one candidate at a time; types are counted as they pass
+        chunk_type_counts = Counter()
+        chunks = _count_chunk_types(_iter_chunks(candidates_to_process), chunk_type_counts)
         
-        print(f"📊 CHUNK STATISTICS:")
-        print(f"   Total chunks created: {len(chunks)}")
-        
-        # Count chunk types
-        candidate_summaries = sum(1 for c in chunks if c['metadata']['chunk_type'] == 'candidate_summary')
-        position_chunks = sum(1 for c in chunks if c['metadata']['chunk_type'] == 'position')
-        education_chunks = sum(1 for c in chunks if c['metadata']['chunk_type'] == 'education')
-        
-        print(f"   Candidate summary chunks: {candidate_summaries}")
-        print(f"   Position chunks: {position_chunks}")
-        print(f"   Education chunks: {education_chunks}")
-        print(f"   Average chunks per candidate: {len(chunks) / len(candidates_to_process):.1f}")
-        print()
-        
-        # Display chunks by candidate
-        current_candidate = None
-        chunks_shown_for_candidate = 0
-        
-        for i, chunk in enumerate(chunks):
-            metadata = chunk['metadata']
-            candidate_id = metadata['candidate_id']
-            candidate_name = metadata['name']
-            
-            # New candidate
-            if candidate_id != current_candidate:
-                current_candidate = candidate_id
-                chunks_shown_for_candidate = 0
-                
-                print("=" * 60)
-                print(f"👤 CANDIDATE: {candidate_name} (ID: {candidate_id})")
-                print("=" * 60)
-            
-            # Skip if we've shown enough chunks for this candidate
-            chunks_shown_for_candidate += 1
-            if chunks_shown_for_candidate > max_chunks_per_candidate:
-                continue
-            
-            # Display chunk
-            chunk_type = metadata['chunk_type']
-            if chunk_type == 'candidate_summary':
-                chunk_icon = "📋"
-            elif chunk_type == 'education':
-                chunk_icon = "🎓"
-            else:  # position
-                chunk_icon = "💼"
-            
-            print(f"\n{chunk_icon} CHUNK {i+1}: {chunk_type.upper()}")
-            print("-" * 40)
+        # Display chunks by candidate; a candidate's chunks are contiguous
+        for candidate_id, group in itertools.groupby(enumerate(chunks), key=lambda item: item[1].metadata['candidate_id']):
+            first = next(group)
             
-            # Show searchable content
-            print("🔍 SEARCHABLE CONTENT:")
-            content = chunk['content']
-            if content.strip():
-                for line in content.split('\n'):
-                    if line.strip():
-                        print(f"   {line}")
-            else:
-                print("   (Empty content)")
+            sys.stdout.write(f"{'=' * 60}\n👤 CANDIDATE: {first[1].metadata['name']} (ID: {candidate_id})\n{'=' * 60}\n")
             
-            # Show key metadata
-            print(f"\n📝 KEY METADATA:")
-            if chunk_type == 'candidate_summary':
-                print(f"   Candidate: {metadata.get('name', 'Unknown')}")
-                print(f"   Email: {metadata.get('email', 'No email')}")
-                print(f"   Location: {metadata.get('location', 'No location')}")
-                print(f"   Stage: {metadata.get('stage', 'No stage')}")
-            elif chunk_type == 'education':
-                print(f"   Candidate: {metadata.get('name', 'Unknown')}")
-                print(f"   School: {metadata.get('school_name', 'Unknown')}")
-                print(f"   Degree: {metadata.get('degree', 'Unknown')}")
-                print(f"   Education Index: {metadata.get('education_index', 'N/A')}")
-            else:  # position
-                print(f"   Candidate: {metadata.get('name', 'Unknown')}")
-                print(f"   Company: {metadata.get('company', 'Unknown')}")
-                print(f"   Title: {metadata.get('title', 'Unknown')}")
-                print(f"   Duration: {metadata.get('start_date', '')} - {metadata.get('end_date', '')}")
-                print(f"   Position Index: {metadata.get('position_index', 'N/A')}")
+            # Show at most max_chunks_per_candidate chunks, without walking the rest
+            for i, chunk in itertools.islice(itertools.chain([first], group), max_chunks_per_candidate):
+                metadata = chunk.metadata
+                
+                # Display chunk
+                chunk_type = metadata['chunk_type']
+                chunk_icon, metadata_template = CHUNK_DISPLAY.get(chunk_type, CHUNK_DISPLAY['position'])
+                
+                # Each chunk is assembled into one string and written with a single write
+                lines = [
+                    f"\n{chunk_icon} CHUNK {i+1}: {chunk_type.upper()}",
+                    "-" * 40,
+                ]
+                
+                # Show searchable content
+                lines.append("🔍 SEARCHABLE CONTENT:")
+                content = chunk.content
+                if content.strip():
+                    lines.extend(f"   {line}" for line in content.split('\n') if line.strip())
+                else:
+                    lines.append("   (Empty content)")
+                
+                # Show key metadata, falling back to METADATA_DEFAULTS for missing fields
+                lines.append(f"\n📝 KEY METADATA:")
+                lines.append(metadata_template.format_map(ChainMap(metadata, METADATA_DEFAULTS)))
+                
+                lines.append(f"   Chunk Type: {chunk_type}")
+                lines.append(f"   Candidate ID: {candidate_id}")
+                sys.stdout.write("\n".join(lines) + "\n")
             
-            print(f"   Chunk Type: {chunk_type}")
-            print(f"   Candidate ID: {candidate_id}")
+        total_chunks = sum(chunk_type_counts.values())
+        print()
+        print(f"📊 CHUNK STATISTICS:")
+        print(f"   Total chunks created: {total_chunks}")
+        print(f"   Candidate summary chunks: {chunk_type_counts['candidate_summary']}")
+        print(f"   Position chunks: {chunk_type_counts['position']}")
+        print(f"   Education chunks: {chunk_type_counts['education']}")
+        print(f"   Average chunks per candidate: {total_chunks / len(candidates_to_process):.1f}")
         
         print("\n" + "=" * 60)
         print("🎯 SUMMARY")
         print("=" * 60)
         print(f"✅ Successfully processed {len(candidates_to_process)} candidates")
-        print(f"📦 Created {len(chunks)} total searchable chunks")
+        print(f"📦 Created {total_chunks} total searchable chunks")
         print(f"🔍 Each chunk's 'content' field gets embedded and searched")
         print(f"📝 Each chunk's 'metadata' field provides context for display")
         print()
@@ -135,12 +158,30 @@ def view_chunks(resume_file: str, max_candidates: int = 3, max_chunks_per_candid
     except FileNotFoundError:
         print(f"❌ Error: File '{resume_file}' not found")
         print("💡 Make sure the file path is correct")
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"❌ Error: Invalid JSON in '{resume_file}': {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
 
+def _iter_chunks(candidates):
+    """Yield every candidate's chunks in order, chunking across processes for larger previews."""
+    from resume_query.data_processing import process_resume_data_iter, chunk_candidate
+    if len(candidates) <= SERIAL_MAX_CANDIDATES:
+        yield from process_resume_data_iter(candidates)
+        return
+    with multiprocessing.Pool() as pool:
+        for candidate_chunks in pool.imap(chunk_candidate, candidates, chunksize=32):
+            yield from candidate_chunks
+
+
+def _count_chunk_types(chunks, counts: Counter):
+    """Pass chunks through unchanged while tallying their chunk types into counts."""
+    for chunk in chunks:
+        counts[chunk.metadata['chunk_type']] += 1
+        yield chunk
+
+
 def main():
     """Main function with command line arguments."""
     parser = argparse.ArgumentParser(description='View resume chunks without running full RAG system')
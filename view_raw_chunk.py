@@ -5,8 +5,25 @@ Raw Chunk Viewer
 Shows the raw chunk data structure for one candidate.
 """
 
+import sys
 import json
-from resume_query.data_processing import process_resume_data
+import mmap
+import dataclasses
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; the whole file is parsed instead
+    ijson = None
+
+try:
+    import simdjson
+except ImportError:  # simdjson is optional; without ijson the file is loaded with load_resume_file
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; chunks are printed with the json module
+    orjson = None
 
 
 def view_raw_chunk(resume_file: str = 'candidates_with_parsed_resumes.json'):
@@ -14,23 +31,22 @@ def view_raw_chunk(resume_file: str = 'candidates_with_parsed_resumes.json'):
     
     try:
         # Load resume data
-        with open(resume_file, 'r') as f:
-            resume_data = json.load(f)
+        first_candidate = [_load_first_candidate(resume_file)]
         
         # Process just the first candidate
-        first_candidate = [resume_data[0]]
+        from resume_query.data_processing import process_resume_data
         chunks = process_resume_data(first_candidate)
         
         print("🔍 RAW CHUNKS FOR FIRST CANDIDATE")
         print("=" * 50)
-        print(f"Candidate: {chunks[0]['metadata']['name']}")
+        print(f"Candidate: {chunks[0].metadata['name']}")
         print(f"Total chunks created: {len(chunks)}")
         print()
         
         # Print each chunk as raw Python dict
         for i, chunk in enumerate(chunks):
             print(f"CHUNK {i+1}:")
-            print(json.dumps(chunk, indent=2, ensure_ascii=False))
+            _write_json(dataclasses.asdict(chunk))
             print()
             print("-" * 50)
             print()
@@ -39,5 +55,32 @@ def view_raw_chunk(resume_file: str = 'candidates_with_parsed_resumes.json'):
         print(f"Error: {e}")
 
 
+def _load_first_candidate(resume_file: str):
+    """Decode the first candidate, streaming it with ijson or parsing a memory map with simdjson when available."""
+    if ijson is not None:
+        with open(resume_file, 'rb') as f:
+            return next(ijson.items(f, 'item', use_float=True))
+    if simdjson is not None:
+        # The mapping is parsed in place, so the file is never copied into a bytes object
+        with open(resume_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return simdjson.Parser().parse(mapped).at_pointer('/0').as_dict()
+    # Imported here, like view_chunks, so the streaming paths never load the resume_query package to read the file
+    from resume_query.data_processing import load_resume_file
+    return load_resume_file(resume_file)[0]
+
+
+def _write_json(chunk):
+    """Print a chunk as 2-space indented JSON, writing orjson's UTF-8 bytes straight to stdout when possible."""
+    stdout_buffer = getattr(sys.stdout, 'buffer', None)
+    if orjson is None:
+        print(json.dumps(chunk, indent=2, ensure_ascii=False))
+    elif stdout_buffer is None or (sys.stdout.encoding or '').lower().replace('-', '') != 'utf8':
+        print(orjson.dumps(chunk, option=orjson.OPT_INDENT_2).decode())
+    else:
+        # Flush pending text first so the raw bytes land in order
+        sys.stdout.flush()
+        stdout_buffer.write(orjson.dumps(chunk, option=orjson.OPT_INDENT_2) + b"\n")
+
+
 if __name__ == "__main__":
     view_raw_chunk()
\ No newline at end of file
@@ -8,17 +8,24 @@ and then automatically launches the resume query system.
 
 import os
 import time
-import subprocess
 import sys
 
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # inotify is Linux-only; elsewhere the file size is polled
+    INotify = None
+
 def wait_for_file_completion(filepath, check_interval=30, stable_duration=60):
     """
     Wait for a file to stop being modified (indicating writing is complete).
     
+    On Linux with inotify_simple installed the kernel reports writes as they
+    happen; elsewhere the file size is polled every check_interval seconds.
+    
     Args:
         filepath: Path to the file to monitor
-        check_interval: How often to check file size (seconds)
-        stable_duration: How long file size must remain stable (seconds)
+        check_interval: Longest wait between file size checks when polling (seconds)
+        stable_duration: How long the file must go unmodified (seconds)
     """
     if not os.path.exists(filepath):
         print(f"❌ Error: File {filepath} does not exist!")
@@ -27,28 +34,91 @@ def wait_for_file_completion(filepath, check_interval=30, stable_duration=60):
     print(f"📄 Monitoring {filepath} for completion...")
     print(f"⏳ Waiting for file to stop growing (stable for {stable_duration} seconds)...")
     
-    stable_checks_needed = stable_duration // check_interval
+    if INotify is None:
+        current_size = _fallback_poll(filepath, check_interval, stable_duration)
+    else:
+        current_size = _wait_for_quiet(filepath, stable_duration)
+    
+    print(f"✅ File {filepath} appears to be complete!")
+    print(f"📏 Final size: {current_size:,} bytes")
+    return True
+
+def _wait_for_quiet(filepath, stable_duration):
+    """Block until inotify reports no writes to filepath for stable_duration seconds; return its size."""
+    target = os.path.basename(filepath)
+    current_size = os.path.getsize(filepath)
+    print(f"📊 Current file size: {current_size:,} bytes")
+    
+    with INotify() as inotify:
+        # Watch the directory so the file being replaced or recreated is still seen
+        inotify.add_watch(os.path.dirname(os.path.abspath(filepath)),
+                          flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+        last_change = time.monotonic()
+        while True:
+            remaining = stable_duration - (time.monotonic() - last_change)
+            if remaining <= 0:
+                break
+            events = [event for event in inotify.read(timeout=int(remaining * 1000)) if event.name == target]
+            if not events:
+                continue
+            last_change = time.monotonic()
+            # Report once per finished save rather than on every write
+            if any(event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO) for event in events):
+                new_size = os.path.getsize(filepath)
+                print(f"📊 Current file size: {new_size:,} bytes (+{new_size - current_size:,})")
+                current_size = new_size
+    
+    return os.path.getsize(filepath)
+
+def _fallback_poll(filepath, check_interval, stable_duration):
+    """
+    Poll the file until it goes unmodified for stable_duration seconds; return its size.
+    
+    Both size and modification time are compared, so rewrites that keep the
+    size the same still count as changes. Polling starts every second and
+    backs off exponentially to check_interval while the file is unchanged,
+    dropping back to one second on any change.
+    """
+    # Resolve the directory once and stat the file relative to it on each poll
+    dir_fd = None
+    if os.stat in os.supports_dir_fd:
+        dir_fd = os.open(os.path.dirname(os.path.abspath(filepath)), os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        return _poll_until_stable(filepath, dir_fd, check_interval, stable_duration)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+def _poll_until_stable(filepath, dir_fd, check_interval, stable_duration):
+    """Polling loop for _fallback_poll; dir_fd, if given, is the file's open directory."""
+    name = os.path.basename(filepath) if dir_fd is not None else filepath
     last_size = -1
-    stable_count = 0
+    last_mtime_ns = None
+    stable_since = time.monotonic()
+    sleep_seconds = 1
     
-    while stable_count < stable_checks_needed:
-        current_size = os.path.getsize(filepath)
+    while True:
+        stat = os.stat(name, dir_fd=dir_fd)
+        current_size = stat.st_size
+        now = time.monotonic()
         
         # Display current status
-        if current_size != last_size:
+        if (current_size, stat.st_mtime_ns) != (last_size, last_mtime_ns):
             print(f"📊 Current file size: {current_size:,} bytes (+{current_size - last_size:,})")
-            stable_count = 0  # Reset stability counter
+            stable_since = now  # Reset stability timer
+            sleep_seconds = 1
         else:
-            stable_count += 1
-            remaining_checks = stable_checks_needed - stable_count
-            print(f"⏸️  File size stable: {current_size:,} bytes ({remaining_checks} more checks needed)")
+            remaining = stable_duration - (now - stable_since)
+            if remaining <= 0:
+                break
+            print(f"⏸️  File size stable: {current_size:,} bytes ({remaining:.0f}s more needed)")
+            sleep_seconds = min(sleep_seconds * 2, check_interval)
         
-        last_size = current_size
-        time.sleep(check_interval)
+        last_size, last_mtime_ns = current_size, stat.st_mtime_ns
+        # Never sleep past the moment the file would count as stable
+        time.sleep(min(sleep_seconds, max(stable_duration - (now - stable_since), 0.1)))
     
-    print(f"✅ File {filepath} appears to be complete!")
-    print(f"📏 Final size: {current_size:,} bytes")
-    return True
+    return current_size
 
 def run_resume_query():
     """Launch the resume query system."""
@@ -56,9 +126,11 @@ def run_resume_query():
     print("=" * 50)
     
     try:
-        # Run the resume query system
-        subprocess.run([sys.executable, "new_resume_query.py"], check=True)
-    except subprocess.CalledProcessError as e:
+        # Run the resume query system in this process instead of starting a second interpreter
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import new_resume_query
+        new_resume_query.main()
+    except Exception as e:
         print(f"❌ Error running resume query system: {e}")
         return False
     except KeyboardInterrupt: